@@ -5,13 +5,8 @@
 # License: http://snmplabs.com/pysmi/license.html
 #
 try:
-    import importlib
-
-    try:
-        SOURCE_SUFFIXES = importlib.machinery.SOURCE_SUFFIXES
-
-    except Exception:
-        raise ImportError()
+    # submodule is imported explicitly, importlib alone does not load it
+    from importlib.machinery import SOURCE_SUFFIXES
 
 except ImportError:
     import imp
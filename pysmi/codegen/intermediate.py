@@ -21,6 +21,11 @@ if sys.version_info[0] > 2:
     long = int
 
 
+def squeezeWhitespaces(symbol, text):
+    """Default MIB text filter collapsing whitespace runs."""
+    return re.sub(r'\s+', ' ', text)
+
+
 class IntermediateCodeGen(AbstractCodeGen):
     """Turns MIB AST into an intermediate representation.
 
@@ -126,7 +131,7 @@ class IntermediateCodeGen(AbstractCodeGen):
         outDict['class'] = 'imports'
         for module in sorted(imports):
             symbols = []
-            for symbol in set(imports[module]):
+            for symbol in sorted(set(imports[module])):
                 symbols.append(symbol)
 
             if symbols:
@@ -985,7 +990,7 @@ class IntermediateCodeGen(AbstractCodeGen):
 
     def genCode(self, ast, symbolTable, **kwargs):
         self.genRules['text'] = kwargs.get('genTexts', False)
-        self.textFilter = kwargs.get('textFilter') or (lambda symbol, text: re.sub(r'\s+', ' ', text))
+        self.textFilter = kwargs.get('textFilter') or squeezeWhitespaces
         self.symbolTable = symbolTable
         self._rows.clear()
         self._cols.clear()
@@ -8,6 +8,9 @@ from pysmi.mibinfo import MibInfo
 from pysmi.codegen.base import AbstractCodeGen
 from pysmi import debug
 
+# Callers never modify code generation results, so one instance is shared
+_EMPTY_RESULT = MibInfo(oid=None, name='', imported=()), ''
+
 
 class NullCodeGen(AbstractCodeGen):
     """Dummy code generation backend.
@@ -17,7 +20,7 @@ class NullCodeGen(AbstractCodeGen):
 
     def genCode(self, ast, symbolTable, **kwargs):
         debug.logger & debug.flagCodegen and debug.logger('%s invoked' % self.__class__.__name__)
-        return MibInfo(oid=None, name='', imported=[]), ''
+        return _EMPTY_RESULT
 
     def genIndex(self, mibsMap, **kwargs):
         return ''
@@ -7,16 +7,38 @@
 import sys
 import os
 import time
+import threading
+import multiprocessing
+import pickle
+import hashlib
+import tempfile
+from collections import defaultdict, deque
+from functools import partial
+from itertools import islice
 
 try:
     from pwd import getpwuid
 except ImportError:
     # noinspection PyPep8
     getpwuid = lambda x: ['<unknown>']
+
+try:
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+except ImportError:
+    ThreadPoolExecutor = ProcessPoolExecutor = None
+
+try:
+    import asyncio
+
+except ImportError:
+    asyncio = None
+
 from pysmi import __name__ as packageName
 from pysmi import __version__ as packageVersion
 from pysmi.mibinfo import MibInfo
 from pysmi.codegen.symtable import SymtableCodeGen
+from pysmi.compat import encode
 from pysmi import error
 from pysmi import debug
 
@@ -39,8 +61,7 @@ class MibStatus(str):
 
     def setOptions(self, **kwargs):
         n = self.__class__(self)
-        for k in kwargs:
-            setattr(n, k, kwargs[k])
+        n.__dict__.update(kwargs)
         return n
 
 
@@ -51,6 +72,40 @@ statusUnprocessed = MibStatus('unprocessed')
 statusMissing = MibStatus('missing')
 statusBorrowed = MibStatus('borrowed')
 
+_PYTHON_VERSION = sys.version.split('\n', 1)[0]
+
+try:
+    _PLATFORM_INFO = os.uname()
+
+except AttributeError:
+    _PLATFORM_INFO = ('?',) * 6
+
+try:
+    _USER_INFO = getpwuid(os.getuid())
+
+except Exception:
+    _USER_INFO = ('?',) * 7
+
+_CACHE_HOME = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+
+# Code generator and symbol tables of a parallel code generation worker process
+_workerCodegen = None
+_workerSymbolTableMap = None
+
+
+def _initCodegenWorker(codegen, symbolTableMap):
+    global _workerCodegen, _workerSymbolTableMap
+    _workerCodegen = codegen
+    _workerSymbolTableMap = symbolTableMap
+
+
+def _genCodeInWorker(mibTree, kwargs):
+    return _workerCodegen.genCode(mibTree, _workerSymbolTableMap, **kwargs)
+
+
+def _raiseError(exc):
+    raise exc
+
 
 class MibCompiler(object):
     """Top-level, user-facing, composite MIB compiler object.
@@ -74,6 +129,11 @@ class MibCompiler(object):
     *readers*, *searchers* and *borrowers*.
     """
     indexFile = 'index'
+    astCacheDir = os.path.join(_CACHE_HOME, 'pysmi', 'ast')
+    codeCacheDir = os.path.join(_CACHE_HOME, 'pysmi', 'code')
+    # how many queued MIBs to fetch ahead of the one being parsed, in
+    # a background thread; zero keeps source reads in caller's thread
+    prefetchDepth = 0
 
     def __init__(self, parser, codegen, writer):
         """Creates an instance of *MibCompiler* class.
@@ -88,8 +148,10 @@ class MibCompiler(object):
         self._symbolgen = SymtableCodeGen()
         self._writer = writer
         self._sources = []
+        self._fetchExecutor = None
         self._searchers = []
         self._borrowers = []
+        self._compileExecutor = None
 
     def addSources(self, *sources):
         """Add more ASN.1 MIB source repositories.
@@ -157,20 +219,350 @@ class MibCompiler(object):
         return self
 
     def _get_system_info(self):
+        return _PLATFORM_INFO, _USER_INFO
 
+    def _get_base_comments(self):
+        platform_info, user_info = self._get_system_info()
+
+        return [
+            'Produced by %s-%s at %s' % (packageName, packageVersion, time.asctime()),
+            'On host %s platform %s version %s by user %s' % (platform_info[1], platform_info[0],
+                                                              platform_info[2], user_info[0]),
+            'Using Python version %s' % _PYTHON_VERSION
+        ]
+
+    def _get_ast_cache_file(self, fileData, cacheDir):
+        parserClass = self._parser.__class__
+
+        # factory-made parsers differ only in grammar relaxation rules
+        parserId = '%s.%s(%s)' % (
+            parserClass.__module__, parserClass.__name__,
+            ','.join(sorted(x for x in parserClass.__dict__ if not x.startswith('_'))))
+
+        digest = getattr(hashlib, 'blake2b', hashlib.sha1)()
+        digest.update(encode('%s-%s\n%s\n' % (packageName, packageVersion, parserId)))
+        digest.update(encode(fileData))
+
+        return os.path.join(cacheDir, digest.hexdigest() + '.pkl')
+
+    def _get_code_cache_file(self, mibTree, mibInfo, symbolTableMap, kwargs, cacheDir):
+        """Build code cache file name for MIB module.
+
+        Generated code depends on MIB AST, on symbol tables of this MIB and
+        of the MIBs it imports from, on code generation options and on the
+        header comments (except for the time stamp). Returns *None* if the
+        text filter can not be identified by name.
+        """
+        textFilter = kwargs.get('textFilter')
+        if textFilter:
+            textFilter = '%s.%s' % (getattr(textFilter, '__module__', '?'),
+                                    getattr(textFilter, '__name__', '<lambda>'))
+            if textFilter.endswith('<lambda>'):
+                return
+
+        codegenClass = self._codegen.__class__
+
+        platform_info, user_info = self._get_system_info()
+
+        digest = getattr(hashlib, 'blake2b', hashlib.sha1)()
+        digest.update(encode('%s-%s\n%s.%s\n' % (
+            packageName, packageVersion, codegenClass.__module__, codegenClass.__name__)))
+        digest.update(encode(repr((
+            kwargs.get('dstTemplate'), kwargs.get('genTexts'), textFilter,
+            kwargs.get('comments', [None])[0], platform_info[1], platform_info[0], platform_info[2],
+            user_info[0], _PYTHON_VERSION))))
+        digest.update(encode(repr((
+            mibTree, [(x, symbolTableMap.get(x)) for x in [mibInfo.name] + list(mibInfo.imported)]))))
+
+        return os.path.join(cacheDir, digest.hexdigest() + '.pkl')
+
+    @staticmethod
+    def _load_cache_file(cacheFile):
         try:
-            platform_info = os.uname()
+            # unpickling runs code, only trust files no one else could plant
+            if hasattr(os, 'getuid'):
+                for path in (os.path.dirname(cacheFile), cacheFile):
+                    st = os.stat(path)
+                    if st.st_uid != os.getuid() or st.st_mode & 0o022:
+                        raise error.PySmiError('%s is writable by other users' % path)
+
+            with open(cacheFile, 'rb') as f:
+                cached = pickle.load(f)  # nosec
+
+        except Exception as exc:
+            debug.log(debug.flagCompiler, 'cache miss at %s: %s', cacheFile, exc)
+            return
+
+        debug.log(debug.flagCompiler, 'cache hit at %s', cacheFile)
 
-        except AttributeError:
-            platform_info = ('?',) * 6
+        return cached
+
+    @staticmethod
+    def _store_cache_file(cacheFile, data):
+        cacheDir = os.path.dirname(cacheFile)
+
+        tfile = None
 
         try:
-            user_info = getpwuid(os.getuid())
+            if not os.path.exists(cacheDir):
+                os.makedirs(cacheDir, 0o700)
+
+            fd, tfile = tempfile.mkstemp(dir=cacheDir)
+            os.write(fd, pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+            os.close(fd)
+            os.rename(tfile, cacheFile)
+
+        except Exception as exc:
+            debug.log(debug.flagCompiler, 'failed to store cache at %s: %s', cacheFile, exc)
+
+            if tfile and os.access(tfile, os.F_OK):
+                os.unlink(tfile)
+
+        return data
 
-        except Exception:
-            user_info = ('?',) * 7
+    def _parse(self, fileData, symbolTableMap, cacheDir=None):
+        """Parse ASN.1 MIB text and build symbol tables for its MIB modules.
 
-        return platform_info, user_info
+        Yields *(mibTree, mibInfo, symbolTable)* tuples, one per MIB module
+        found in *fileData*.
+
+        If *cacheDir* is given, the results are pickled there keyed by
+        hash of MIB text and parser flavor so that repeated compilation of
+        the same MIB text skips parsing altogether.
+        """
+        cacheFile = None
+
+        if cacheDir:
+            cacheFile = self._get_ast_cache_file(fileData, cacheDir)
+
+            parsed = self._load_cache_file(cacheFile)
+            if parsed is not None:
+                for mibTree, mibInfo, symbolTable in parsed:
+                    yield mibTree, mibInfo, symbolTable
+
+                return
+
+        parsed = []
+
+        for mibTree in self._parser.parse(fileData):
+            mibInfo, symbolTable = self._symbolgen.genCode(
+                mibTree, symbolTableMap
+            )
+
+            parsed.append((mibTree, mibInfo, symbolTable))
+
+            yield mibTree, mibInfo, symbolTable
+
+        if cacheFile:
+            self._store_cache_file(cacheFile, parsed)
+
+    def _read_from_sources(self, mibname):
+        """Query configured sources for ASN.1 MIB in order of their addition.
+
+        Stops at the first source that has the MIB. Returns a list of
+        *(source, fetch)* pairs, one per source queried, where *fetch* is
+        a callable returning *getData* result or raising its exception.
+        """
+        fetched = []
+
+        for source in self._sources:
+            try:
+                fileInfo, fileData = source.getData(mibname)
+
+            except error.PySmiError as exc:
+                fetched.append((source, partial(_raiseError, exc)))
+                continue
+
+            fetched.append((source, lambda result=(fileInfo, fileData): result))
+            break
+
+        return fetched
+
+    def _prefetch_from_sources(self, mibnames, fetches):
+        """Start fetching ASN.1 MIBs ahead of time.
+
+        Source queries for *mibnames* are queued to a background thread,
+        while the caller is busy parsing, and remembered in the *fetches*
+        dict for *_fetch_from_sources* to pick up. All source queries go
+        through that single thread so that no reader object is ever
+        entered concurrently.
+        """
+        if self._fetchExecutor is None:
+            return
+
+        for mibname in mibnames:
+            if mibname not in fetches:
+                fetches[mibname] = self._fetchExecutor.submit(self._read_from_sources, mibname)
+
+    def _fetch_from_sources(self, mibname, fetches):
+        """Fetch ASN.1 MIB from configured sources in order of their addition.
+
+        Yields *(source, fetch)* pairs, where *fetch* is a callable returning
+        *getData* result or raising its exception. Sources are queried until
+        the first one has the MIB, possibly ahead of time by
+        *_prefetch_from_sources*. Should the caller reject that MIB and keep
+        iterating, the remaining sources are queried on demand.
+        """
+        self._prefetch_from_sources([mibname], fetches)
+
+        future = fetches.pop(mibname, None)
+
+        fetched = future and future.result() or self._read_from_sources(mibname)
+
+        for source, fetch in fetched:
+            yield source, fetch
+
+        for source in self._sources[len(fetched):]:
+            if self._fetchExecutor is None:
+                yield source, partial(source.getData, mibname)
+
+            else:
+                yield source, self._fetchExecutor.submit(source.getData, mibname).result
+
+    @staticmethod
+    def _cancel_fetch(mibname, fetches):
+        """Drop MIB fetch that will not be picked up."""
+        future = fetches.pop(mibname, None)
+        if future is not None:
+            future.cancel()
+
+    def _stop_fetching(self, fetches):
+        """Drop MIB fetches not picked up and stop the fetching thread."""
+        for mibname in list(fetches):
+            self._cancel_fetch(mibname, fetches)
+
+        if self._fetchExecutor is not None:
+            self._fetchExecutor.shutdown(wait=True)
+            self._fetchExecutor = None
+
+    def _check_searchers(self, mibname, mtime, **options):
+        """Look up up-to-date transformed MIB with configured searchers.
+
+        Returns *statusUntouched* if any of the searchers reports that
+        transformed MIB exists and is not older than *mtime*, *None*
+        otherwise. Searcher errors are logged and otherwise ignored.
+        """
+        for searcher in self._searchers:
+            try:
+                searcher.fileExists(mibname, mtime, rebuild=options.get('rebuild'))
+
+            except error.PySmiFileNotFoundError:
+                debug.log(debug.flagCompiler, 'no compiled MIB %s available through %s', mibname, searcher)
+
+            except error.PySmiFileNotModifiedError:
+                debug.log(debug.flagCompiler, 'will be using existing compiled MIB %s found by %s', mibname, searcher)
+                return statusUntouched
+
+            except error.PySmiError as exc:
+                exc.searcher = searcher
+                exc.mibname = mibname
+                exc.msg += ' at MIB %s' % mibname
+
+                debug.log(debug.flagCompiler, 'error from %s: %s', searcher, exc)
+
+        debug.log(debug.flagCompiler, 'no suitable compiled MIB %s found anywhere', mibname)
+
+    def _generate_code(self, parsedMibs, symbolTableMap, **options):
+        """Run code generator against parsed MIBs.
+
+        Yields *(mibname, generate)* pairs, where *generate* is a callable
+        returning *genCode* result or raising its exception.
+
+        With *jobs* option greater than one, MIBs are handed over to a pool
+        of worker processes, each holding its own copy of the code generator
+        and of the (by now complete) symbol tables. Code generation falls
+        back to running serially if these can not be pickled (e.g. when
+        *textFilter* is a lambda) or if other threads are running, as
+        worker processes are forked.
+
+        With *codeCache* option, generated code is pickled into the given
+        directory and reused for MIBs that would yield the same code. Those
+        MIBs are yielded first.
+        """
+        tasks = []
+        cached = []
+
+        baseComments = self._get_base_comments()
+
+        cacheDir = options.get('codeCache')
+        if cacheDir is True:
+            cacheDir = self.codeCacheDir
+
+        for mibname in parsedMibs:
+            fileInfo, mibInfo, mibTree = parsedMibs[mibname]
+
+            kwargs = dict(
+                comments=['ASN.1 source %s' % fileInfo.path] + baseComments,
+                dstTemplate=options.get('dstTemplate'),
+                genTexts=options.get('genTexts'),
+                textFilter=options.get('textFilter')
+            )
+
+            cacheFile = None
+
+            if cacheDir:
+                cacheFile = self._get_code_cache_file(mibTree, mibInfo, symbolTableMap, kwargs, cacheDir)
+
+                generated = cacheFile and self._load_cache_file(cacheFile)
+                if generated is not None:
+                    cached.append((mibname, generated))
+                    continue
+
+            tasks.append((mibname, mibTree, kwargs, cacheFile))
+
+        for mibname, generated in cached:
+            yield mibname, lambda generated=generated: generated
+
+        jobs = options.get('jobs') or 1
+
+        if (jobs > 1 and len(tasks) > 1 and
+                ProcessPoolExecutor is not None and sys.version_info[:2] >= (3, 7)):
+            try:
+                # forking process running other threads risks deadlocks on
+                # locks they hold, other start methods re-run caller's __main__
+                if threading.active_count() > 1:
+                    raise error.PySmiError('other threads are running')
+
+                pickle.dumps((self._codegen, symbolTableMap, tasks), pickle.HIGHEST_PROTOCOL)
+
+            except Exception as exc:
+                debug.log(
+                    debug.flagCompiler, 'can not start worker processes, '
+                    'generating code serially: %s', exc)
+
+            else:
+                debug.log(debug.flagCompiler, 'generating code in %s worker processes', jobs)
+
+                if 'fork' in multiprocessing.get_all_start_methods():
+                    mpContext = multiprocessing.get_context('fork')
+
+                else:
+                    mpContext = multiprocessing.get_context()
+
+                with ProcessPoolExecutor(max_workers=jobs, mp_context=mpContext,
+                                         initializer=_initCodegenWorker,
+                                         initargs=(self._codegen, symbolTableMap)) as pool:
+                    futures = [(mibname, pool.submit(_genCodeInWorker, mibTree, kwargs), cacheFile)
+                               for mibname, mibTree, kwargs, cacheFile in tasks]
+
+                    for mibname, future, cacheFile in futures:
+                        if cacheFile:
+                            yield mibname, lambda future=future, cacheFile=cacheFile: self._store_cache_file(
+                                cacheFile, future.result())
+
+                        else:
+                            yield mibname, future.result
+
+                return
+
+        for mibname, mibTree, kwargs, cacheFile in tasks:
+            if cacheFile:
+                yield mibname, lambda mibTree=mibTree, kwargs=kwargs, cacheFile=cacheFile: self._store_cache_file(
+                    cacheFile, self._codegen.genCode(mibTree, symbolTableMap, **kwargs))
+
+            else:
+                yield mibname, lambda mibTree=mibTree, kwargs=kwargs: self._codegen.genCode(
+                    mibTree, symbolTableMap, **kwargs)
 
     def compile(self, *mibnames, **options):
         """Transform requested and possibly referred MIBs.
@@ -206,81 +598,110 @@ class MibCompiler(object):
         borrowedMibs = {}
         builtMibs = {}
         symbolTableMap = {}
-        mibsToParse = [x for x in mibnames]
-        canonicalMibNames = {}
+        fetches = {}
+        mibsToParse = deque(mibnames)
+        queued = set(mibnames)
+        canonicalMibNames = defaultdict(list)
 
-        while mibsToParse:
-            mibname = mibsToParse.pop(0)
+        codegen = self._codegen
+        writer = self._writer
+        borrowers = self._borrowers
 
-            if mibname in parsedMibs:
-                debug.logger & debug.flagCompiler and debug.logger('MIB %s already parsed' % mibname)
-                continue
+        noDeps = options.get('noDeps')
+        ignoreErrors = options.get('ignoreErrors')
 
-            if mibname in failedMibs:
-                debug.logger & debug.flagCompiler and debug.logger('MIB %s already failed' % mibname)
-                continue
+        astCacheDir = options.get('astCache')
+        if astCacheDir is True:
+            astCacheDir = self.astCacheDir
 
-            for source in self._sources:
-                debug.logger & debug.flagCompiler and debug.logger('trying source %s' % source)
+        prefetchDepth = options.get('prefetchDepth', self.prefetchDepth)
 
-                try:
-                    fileInfo, fileData = source.getData(mibname)
+        if prefetchDepth and ThreadPoolExecutor is not None:
+            self._fetchExecutor = ThreadPoolExecutor(max_workers=1)
 
-                    for mibTree in self._parser.parse(fileData):
-                        mibInfo, symbolTable = self._symbolgen.genCode(
-                            mibTree, symbolTableMap
-                        )
+        try:
+            while mibsToParse:
+                mibname = mibsToParse.popleft()
 
-                        symbolTableMap[mibInfo.name] = symbolTable
+                if mibname in parsedMibs:
+                    debug.log(debug.flagCompiler, 'MIB %s already parsed', mibname)
+                    self._cancel_fetch(mibname, fetches)
+                    continue
 
-                        parsedMibs[mibInfo.name] = fileInfo, mibInfo, mibTree
+                if mibname in failedMibs:
+                    debug.log(debug.flagCompiler, 'MIB %s already failed', mibname)
+                    self._cancel_fetch(mibname, fetches)
+                    continue
 
-                        if mibname in failedMibs:
-                            del failedMibs[mibname]
+                upcoming = [x for x in islice(mibsToParse, prefetchDepth)
+                            if x not in parsedMibs and x not in failedMibs]
 
-                        mibsToParse.extend(mibInfo.imported)
+                self._prefetch_from_sources([mibname] + upcoming, fetches)
 
-                        if fileInfo.name in mibnames:
-                            if mibInfo.name not in canonicalMibNames:
-                                canonicalMibNames[mibInfo.name] = []
-                            canonicalMibNames[mibInfo.name].append(fileInfo.name)
+                for source, fetch in self._fetch_from_sources(mibname, fetches):
+                    debug.log(debug.flagCompiler, 'trying source %s', source)
 
-                        debug.logger & debug.flagCompiler and debug.logger(
-                            '%s (%s) read from %s, immediate dependencies: %s' % (
-                                mibInfo.name, mibname, fileInfo.path, ', '.join(mibInfo.imported) or '<none>'))
+                    try:
+                        fileInfo, fileData = fetch()
 
-                    break
+                        for mibTree, mibInfo, symbolTable in self._parse(fileData, symbolTableMap, astCacheDir):
+                            symbolTableMap[mibInfo.name] = symbolTable
 
-                except error.PySmiReaderFileNotFoundError:
-                    debug.logger & debug.flagCompiler and debug.logger('no %s found at %s' % (mibname, source))
-                    continue
+                            parsedMibs[mibInfo.name] = fileInfo, mibInfo, mibTree
 
-                except error.PySmiError:
-                    exc_class, exc, tb = sys.exc_info()
-                    exc.source = source
-                    exc.mibname = mibname
-                    exc.msg += ' at MIB %s' % mibname
+                            if mibname in failedMibs:
+                                del failedMibs[mibname]
 
-                    debug.logger & debug.flagCompiler and debug.logger('%serror %s from %s' % (
-                        options.get('ignoreErrors') and 'ignoring ' or 'failing on ', exc, source))
+                            imported = []
 
-                    failedMibs[mibname] = exc
+                            for x in mibInfo.imported:
+                                if x not in queued and x not in parsedMibs and x not in failedMibs:
+                                    queued.add(x)
+                                    imported.append(x)
 
-                    processed[mibname] = statusFailed.setOptions(error=exc)
+                            mibsToParse.extend(imported)
 
-            else:
-                exc = error.PySmiError('MIB source %s not found' % mibname)
-                exc.mibname = mibname
-                debug.logger & debug.flagCompiler and debug.logger('no %s found everywhere' % mibname)
+                            if fileInfo.name in mibnames:
+                                canonicalMibNames[mibInfo.name].append(fileInfo.name)
 
-                if mibname not in failedMibs:
-                    failedMibs[mibname] = exc
+                            debug.logger & debug.flagCompiler and debug.logger(
+                                '%s (%s) read from %s, immediate dependencies: %s' % (
+                                    mibInfo.name, mibname, fileInfo.path, ', '.join(mibInfo.imported) or '<none>'))
 
-                if mibname not in processed:
-                    processed[mibname] = statusMissing
+                        break
 
-        debug.logger & debug.flagCompiler and debug.logger(
-            'MIBs analyzed %s, MIBs failed %s' % (len(parsedMibs), len(failedMibs)))
+                    except error.PySmiReaderFileNotFoundError:
+                        debug.log(debug.flagCompiler, 'no %s found at %s', mibname, source)
+                        continue
+
+                    except error.PySmiError as exc:
+                        exc.source = source
+                        exc.mibname = mibname
+                        exc.msg += ' at MIB %s' % mibname
+
+                        debug.log(
+                            debug.flagCompiler, '%serror %s from %s',
+                            ignoreErrors and 'ignoring ' or 'failing on ', exc, source)
+
+                        failedMibs[mibname] = exc
+
+                        processed[mibname] = statusFailed.setOptions(error=exc)
+
+                else:
+                    exc = error.PySmiError('MIB source %s not found' % mibname)
+                    exc.mibname = mibname
+                    debug.log(debug.flagCompiler, 'no %s found everywhere', mibname)
+
+                    if mibname not in failedMibs:
+                        failedMibs[mibname] = exc
+
+                    if mibname not in processed:
+                        processed[mibname] = statusMissing
+
+        finally:
+            self._stop_fetching(fetches)
+
+        debug.log(debug.flagCompiler, 'MIBs analyzed %s, MIBs failed %s', len(parsedMibs), len(failedMibs))
 
         #
         # See what MIBs need generating
@@ -289,108 +710,61 @@ class MibCompiler(object):
         for mibname in tuple(parsedMibs):
             fileInfo, mibInfo, mibTree = parsedMibs[mibname]
 
-            debug.logger & debug.flagCompiler and debug.logger('checking if %s requires updating' % mibname)
-
-            for searcher in self._searchers:
-                try:
-                    searcher.fileExists(mibname, fileInfo.mtime, rebuild=options.get('rebuild'))
-
-                except error.PySmiFileNotFoundError:
-                    debug.logger & debug.flagCompiler and debug.logger(
-                        'no compiled MIB %s available through %s' % (mibname, searcher))
-                    continue
+            debug.log(debug.flagCompiler, 'checking if %s requires updating', mibname)
 
-                except error.PySmiFileNotModifiedError:
-                    debug.logger & debug.flagCompiler and debug.logger(
-                        'will be using existing compiled MIB %s found by %s' % (mibname, searcher))
-                    del parsedMibs[mibname]
-                    processed[mibname] = statusUntouched
-                    break
+            status = self._check_searchers(mibname, fileInfo.mtime, **options)
 
-                except error.PySmiError:
-                    exc_class, exc, tb = sys.exc_info()
-                    exc.searcher = searcher
-                    exc.mibname = mibname
-                    exc.msg += ' at MIB %s' % mibname
-                    debug.logger & debug.flagCompiler and debug.logger('error from %s: %s' % (searcher, exc))
-                    continue
+            if status is None and noDeps and mibname not in canonicalMibNames:
+                debug.log(debug.flagCompiler, 'excluding imported MIB %s from code generation', mibname)
+                status = statusUntouched
 
-            else:
-                debug.logger & debug.flagCompiler and debug.logger(
-                    'no suitable compiled MIB %s found anywhere' % mibname)
-
-                if options.get('noDeps') and mibname not in canonicalMibNames:
-                    debug.logger & debug.flagCompiler and debug.logger(
-                        'excluding imported MIB %s from code generation' % mibname)
-                    del parsedMibs[mibname]
-                    processed[mibname] = statusUntouched
-                    continue
+            if status is not None:
+                del parsedMibs[mibname]
+                processed[mibname] = status
 
-        debug.logger & debug.flagCompiler and debug.logger(
-            'MIBs parsed %s, MIBs failed %s' % (len(parsedMibs), len(failedMibs)))
+        debug.log(debug.flagCompiler, 'MIBs parsed %s, MIBs failed %s', len(parsedMibs), len(failedMibs))
 
         #
         # Generate code for parsed MIBs
         #
 
-        for mibname in parsedMibs.copy():
-            fileInfo, mibInfo, mibTree = parsedMibs[mibname]
-
-            debug.logger & debug.flagCompiler and debug.logger('compiling %s read from %s' % (mibname, fileInfo.path))
-
-            platform_info, user_info = self._get_system_info()
+        for mibname, generate in self._generate_code(parsedMibs, symbolTableMap, **options):
+            fileInfo, mibInfo, mibTree = parsedMibs.pop(mibname)
 
-            comments = [
-                'ASN.1 source %s' % fileInfo.path,
-                'Produced by %s-%s at %s' % (packageName, packageVersion, time.asctime()),
-                'On host %s platform %s version %s by user %s' % (platform_info[1], platform_info[0],
-                                                                  platform_info[2], user_info[0]),
-                'Using Python version %s' % sys.version.split('\n')[0]
-            ]
+            debug.log(debug.flagCompiler, 'compiling %s read from %s', mibname, fileInfo.path)
 
             try:
-                mibInfo, mibData = self._codegen.genCode(
-                    mibTree,
-                    symbolTableMap,
-                    comments=comments,
-                    dstTemplate=options.get('dstTemplate'),
-                    genTexts=options.get('genTexts'),
-                    textFilter=options.get('textFilter')
-                )
+                mibInfo, mibData = generate()
 
                 builtMibs[mibname] = fileInfo, mibInfo, mibData
-                del parsedMibs[mibname]
 
-                debug.logger & debug.flagCompiler and debug.logger(
-                    '%s read from %s and compiled by %s' % (mibname, fileInfo.path, self._writer))
+                debug.log(
+                    debug.flagCompiler, '%s read from %s and compiled by %s', mibname, fileInfo.path, writer)
 
-            except error.PySmiError:
-                exc_class, exc, tb = sys.exc_info()
-                exc.handler = self._codegen
+            except error.PySmiError as exc:
+                exc.handler = codegen
                 exc.mibname = mibname
                 exc.msg += ' at MIB %s' % mibname
 
-                debug.logger & debug.flagCompiler and debug.logger('error from %s: %s' % (self._codegen, exc))
+                debug.log(debug.flagCompiler, 'error from %s: %s', codegen, exc)
 
                 processed[mibname] = statusFailed.setOptions(error=exc)
 
                 failedMibs[mibname] = exc
-                del parsedMibs[mibname]
 
-        debug.logger & debug.flagCompiler and debug.logger(
-            'MIBs built %s, MIBs failed %s' % (len(parsedMibs), len(failedMibs)))
+        debug.log(debug.flagCompiler, 'MIBs built %s, MIBs failed %s', len(parsedMibs), len(failedMibs))
 
         #
         # Try to borrow pre-compiled MIBs for failed ones
         #
 
-        for mibname in failedMibs.copy():
-            if options.get('noDeps') and mibname not in canonicalMibNames:
-                debug.logger & debug.flagCompiler and debug.logger('excluding imported MIB %s from borrowing' % mibname)
+        for mibname in list(failedMibs):
+            if noDeps and mibname not in canonicalMibNames:
+                debug.log(debug.flagCompiler, 'excluding imported MIB %s from borrowing', mibname)
                 continue
 
-            for borrower in self._borrowers:
-                debug.logger & debug.flagCompiler and debug.logger('trying to borrow %s from %s' % (mibname, borrower))
+            for borrower in borrowers:
+                debug.log(debug.flagCompiler, 'trying to borrow %s from %s', mibname, borrower)
                 try:
                     fileInfo, fileData = borrower.getData(
                         mibname,
@@ -401,77 +775,49 @@ class MibCompiler(object):
 
                     del failedMibs[mibname]
 
-                    debug.logger & debug.flagCompiler and debug.logger('%s borrowed with %s' % (mibname, borrower))
+                    debug.log(debug.flagCompiler, '%s borrowed with %s', mibname, borrower)
                     break
 
-                except error.PySmiError:
-                    debug.logger & debug.flagCompiler and debug.logger('error from %s: %s' % (borrower, sys.exc_info()[1]))
+                except error.PySmiError as exc:
+                    debug.log(debug.flagCompiler, 'error from %s: %s', borrower, exc)
 
-        debug.logger & debug.flagCompiler and debug.logger(
-            'MIBs available for borrowing %s, MIBs failed %s' % (len(borrowedMibs), len(failedMibs)))
+        debug.log(
+            debug.flagCompiler, 'MIBs available for borrowing %s, MIBs failed %s', len(borrowedMibs), len(failedMibs))
 
         #
         # See what MIBs need borrowing
         #
 
-        for mibname in borrowedMibs.copy():
-            debug.logger & debug.flagCompiler and debug.logger('checking if failed MIB %s requires borrowing' % mibname)
+        for mibname in list(borrowedMibs):
+            debug.log(debug.flagCompiler, 'checking if failed MIB %s requires borrowing', mibname)
 
-            fileInfo, mibInfo, mibData = borrowedMibs[mibname]
+            fileInfo, mibInfo, mibData = borrowedMibs.pop(mibname)
 
-            for searcher in self._searchers:
-                try:
-                    searcher.fileExists(mibname, fileInfo.mtime, rebuild=options.get('rebuild'))
+            status = self._check_searchers(mibname, fileInfo.mtime, **options)
 
-                except error.PySmiFileNotFoundError:
-                    debug.logger & debug.flagCompiler and debug.logger(
-                        'no compiled MIB %s available through %s' % (mibname, searcher))
-                    continue
+            if status is not None:
+                processed[mibname] = status
 
-                except error.PySmiFileNotModifiedError:
-                    debug.logger & debug.flagCompiler and debug.logger(
-                        'will be using existing compiled MIB %s found by %s' % (mibname, searcher))
-                    del borrowedMibs[mibname]
-                    processed[mibname] = statusUntouched
-                    break
+            elif noDeps and mibname not in canonicalMibNames:
+                debug.log(debug.flagCompiler, 'excluding imported MIB %s from borrowing', mibname)
+                processed[mibname] = statusUntouched
 
-                except error.PySmiError:
-                    exc_class, exc, tb = sys.exc_info()
-                    exc.searcher = searcher
-                    exc.mibname = mibname
-                    exc.msg += ' at MIB %s' % mibname
-
-                    debug.logger & debug.flagCompiler and debug.logger('error from %s: %s' % (searcher, exc))
-
-                    continue
             else:
-                debug.logger & debug.flagCompiler and debug.logger(
-                    'no suitable compiled MIB %s found anywhere' % mibname)
-
-                if options.get('noDeps') and mibname not in canonicalMibNames:
-                    debug.logger & debug.flagCompiler and debug.logger(
-                        'excluding imported MIB %s from borrowing' % mibname)
-                    processed[mibname] = statusUntouched
-
-                else:
-                    debug.logger & debug.flagCompiler and debug.logger('will borrow MIB %s' % mibname)
-                    builtMibs[mibname] = borrowedMibs[mibname]
-
-                    processed[mibname] = statusBorrowed.setOptions(
-                        path=fileInfo.path, file=fileInfo.file,
-                        alias=fileInfo.name
-                    )
+                debug.log(debug.flagCompiler, 'will borrow MIB %s', mibname)
+                builtMibs[mibname] = fileInfo, mibInfo, mibData
 
-                del borrowedMibs[mibname]
+                processed[mibname] = statusBorrowed.setOptions(
+                    path=fileInfo.path, file=fileInfo.file,
+                    alias=fileInfo.name
+                )
 
-        debug.logger & debug.flagCompiler and debug.logger(
-            'MIBs built %s, MIBs failed %s' % (len(builtMibs), len(failedMibs)))
+        debug.log(debug.flagCompiler, 'MIBs built %s, MIBs failed %s', len(builtMibs), len(failedMibs))
 
         #
         # We could attempt to ignore missing/failed MIBs
         #
 
-        if failedMibs and not options.get('ignoreErrors'):
+        if failedMibs and not ignoreErrors:
             debug.logger & debug.flagCompiler and debug.logger('failing with problem MIBs %s' % ', '.join(failedMibs))
 
             for mibname in builtMibs:
@@ -486,18 +832,16 @@ class MibCompiler(object):
         # Store compiled MIBs
         #
 
-        for mibname in builtMibs.copy():
-            fileInfo, mibInfo, mibData = builtMibs[mibname]
+        for mibname in list(builtMibs):
+            fileInfo, mibInfo, mibData = builtMibs.pop(mibname)
 
             try:
                 if options.get('writeMibs', True):
-                    self._writer.putData(
+                    writer.putData(
                         mibname, mibData, dryRun=options.get('dryRun')
                     )
 
-                debug.logger & debug.flagCompiler and debug.logger('%s stored by %s' % (mibname, self._writer))
-
-                del builtMibs[mibname]
+                debug.log(debug.flagCompiler, '%s stored by %s', mibname, writer)
 
                 if mibname not in processed:
                     processed[mibname] = statusCompiled.setOptions(
@@ -512,53 +856,66 @@ class MibCompiler(object):
                         compliance=mibInfo.compliance,
                     )
 
-            except error.PySmiError:
-                exc_class, exc, tb = sys.exc_info()
-                exc.handler = self._codegen
+            except error.PySmiError as exc:
+                exc.handler = codegen
                 exc.mibname = mibname
                 exc.msg += ' at MIB %s' % mibname
 
-                debug.logger & debug.flagCompiler and debug.logger('error %s from %s' % (exc, self._writer))
+                debug.log(debug.flagCompiler, 'error %s from %s', exc, writer)
 
                 processed[mibname] = statusFailed.setOptions(error=exc)
                 failedMibs[mibname] = exc
-                del builtMibs[mibname]
 
-        debug.logger & debug.flagCompiler and debug.logger(
-            'MIBs modified: %s' % ', '.join([x for x in processed if processed[x] in ('compiled', 'borrowed')]))
+        debug.logger & debug.flagCompiler and debug.logger('MIBs modified: %s' % ', '.join(
+            [x for x, status in processed.items() if status in (statusCompiled, statusBorrowed)]))
 
         return processed
 
-    def buildIndex(self, processedMibs, **options):
-        platform_info, user_info = self._get_system_info()
+    def compileAsync(self, *mibnames, **options):
+        """Transform requested and possibly referred MIBs from asyncio code.
 
-        comments = [
-            'Produced by %s-%s at %s' % (packageName, packageVersion, time.asctime()),
-            'On host %s platform %s version %s by user %s' % (platform_info[1], platform_info[0],
-                                                              platform_info[2], user_info[0]),
-            'Using Python version %s' % sys.version.split('\n')[0]
-        ]
+        Runs *compile* in a background thread and returns an asyncio future
+        which resolves into *compile* return value, so that the calling
+        coroutine could await the results without blocking its event loop.
+        Calls to *compileAsync* on the same *MibCompiler* are carried out
+        one after another.
+
+        Args:
+            mibnames: list of ASN.1 MIBs names
+            options: options that affect the way PySMI components work
+
+        Returns:
+            An asyncio future resolving into a dictionary of MIB module
+            names processed (keys) and *MibStatus* class instances (values)
 
+        """
+        if asyncio is None or ThreadPoolExecutor is None:
+            raise error.PySmiError('asyncio support is not available')
+
+        if self._compileExecutor is None:
+            self._compileExecutor = ThreadPoolExecutor(max_workers=1)
+
+        return asyncio.wrap_future(
+            self._compileExecutor.submit(partial(self.compile, *mibnames, **options))
+        )
+
+    def buildIndex(self, processedMibs, **options):
         try:
             self._writer.putData(
                 self.indexFile,
                 self._codegen.genIndex(
                     processedMibs,
-                    comments=comments,
+                    comments=self._get_base_comments(),
                     old_index_data=self._writer.getData(self.indexFile)
                 ),
                 dryRun=options.get('dryRun')
             )
-        except error.PySmiError:
-            exc_class, exc, tb = sys.exc_info()
+        except error.PySmiError as exc:
             exc.msg += ' at MIB index %s' % self.indexFile
 
-            debug.logger & debug.flagCompiler and debug.logger('error %s when building %s' % (exc, self.indexFile))
+            debug.log(debug.flagCompiler, 'error %s when building %s', exc, self.indexFile)
 
             if options.get('ignoreErrors'):
                 return
 
-            if hasattr(exc, 'with_traceback'):
-                raise exc.with_traceback(tb)
-            else:
-                raise exc
+            raise
@@ -140,3 +140,16 @@ logger = 0
 def setLogger(l):
     global logger
     logger = l
+
+
+def log(flag, msg, *args):
+    """Log debug message if *flag* category is enabled.
+
+    The message is %-formatted with *args* only when it is actually
+    going to be logged.
+    """
+    if logger & flag:
+        if args:
+            msg %= args
+
+        logger(msg)
@@ -18,12 +18,12 @@ class PySmiError(Exception):
     def __init__(self, *args, **kwargs):
         Exception.__init__(self, *args)
         self.msg = args and args[0] or ''
-        for k in kwargs:
-            setattr(self, k, kwargs[k])
+        if kwargs:
+            self.__dict__.update(kwargs)
 
     def __repr__(self):
         return '%s(%s)' % (self.__class__.__name__, ', '.join(
-            ['%s=%r' % (k, getattr(self, k)) for k in dir(self) if k[0] != '_' and k != 'args']))
+            ['%s=%r' % (k, v) for k, v in sorted(self.__dict__.items()) if k[0] != '_']))
 
     def __str__(self):
         return self.msg
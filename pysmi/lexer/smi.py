@@ -14,63 +14,87 @@ from pysmi import debug
 UNSIGNED32_MAX = 4294967295
 UNSIGNED64_MAX = 18446744073709551615
 LEX_VERSION = [int(x) for x in lex.__version__.split('.')]
+# SMI grammar is ASCII-only, spare the regexp engine Unicode matching
+LEX_REFLAGS = re.DOTALL | getattr(re, 'ASCII', 0)
+
+# Token names required!
+TOKENS = (
+    'BIN_STRING',
+    'CHOICE',
+    'COLON_COLON_EQUAL',
+    'DOT_DOT',
+    'EXPORTS',
+    'HEX_STRING',
+    'LOWERCASE_IDENTIFIER',
+    'MACRO',
+    'NEGATIVENUMBER',
+    'NEGATIVENUMBER64',
+    'NUMBER',
+    'NUMBER64',
+    'QUOTED_STRING',
+    'UPPERCASE_IDENTIFIER',
+)
+
+SMIV2_RESERVED_WORDS = (
+    'ACCESS', 'AGENT-CAPABILITIES', 'APPLICATION', 'AUGMENTS', 'BEGIN', 'BITS',
+    'CONTACT-INFO', 'CREATION-REQUIRES', 'Counter', 'Counter32', 'Counter64',
+    'DEFINITIONS', 'DEFVAL', 'DESCRIPTION', 'DISPLAY-HINT', 'END', 'ENTERPRISE',
+    'EXTENDS', 'FROM', 'GROUP', 'Gauge', 'Gauge32', 'IDENTIFIER', 'IMPLICIT',
+    'IMPLIED', 'IMPORTS', 'INCLUDES', 'INDEX', 'INSTALL-ERRORS', 'INTEGER',
+    'Integer32', 'IpAddress', 'LAST-UPDATED', 'MANDATORY-GROUPS',
+    'MAX-ACCESS', 'MIN-ACCESS', 'MODULE', 'MODULE-COMPLIANCE',
+    'MODULE-IDENTITY', 'NOTIFICATION-GROUP', 'NOTIFICATION-TYPE',
+    'NOTIFICATIONS', 'OBJECT', 'OBJECT-GROUP', 'OBJECT-IDENTITY', 'OBJECT-TYPE',
+    'OBJECTS', 'OCTET', 'OF', 'ORGANIZATION', 'Opaque', 'PIB-ACCESS',
+    'PIB-DEFINITIONS', 'PIB-INDEX', 'PIB-MIN-ACCESS', 'PIB-REFERENCES',
+    'PIB-TAG', 'POLICY-ACCESS', 'PRODUCT-RELEASE', 'REFERENCE', 'REVISION',
+    'SEQUENCE', 'SIZE', 'STATUS', 'STRING', 'SUBJECT-CATEGORIES', 'SUPPORTS',
+    'SYNTAX', 'TEXTUAL-CONVENTION', 'TimeTicks', 'TRAP-TYPE', 'UNIQUENESS',
+    'UNITS', 'UNIVERSAL', 'Unsigned32', 'VALUE', 'VARIABLES',
+    'VARIATION', 'WRITE-SYNTAX'
+)
+
+SMIV2_FORBIDDEN_WORDS = (
+    'ABSENT', 'ANY', 'BIT', 'BOOLEAN', 'BY', 'COMPONENT', 'COMPONENTS',
+    'DEFAULT', 'DEFINED', 'ENUMERATED', 'EXPLICIT', 'EXTERNAL', 'FALSE', 'MAX',
+    'MIN', 'MINUS-INFINITY', 'NULL', 'OPTIONAL', 'PLUS-INFINITY', 'PRESENT',
+    'PRIVATE', 'REAL', 'SET', 'TAGS', 'TRUE', 'WITH'
+)
+
+# SMIv1 has MAX as a keyword rather than a forbidden word, plus NetworkAddress
+SMIV1_RESERVED_WORDS = SMIV2_RESERVED_WORDS + ('MAX', 'NetworkAddress')
+
+SMIV1_FORBIDDEN_WORDS = frozenset(SMIV2_FORBIDDEN_WORDS) - frozenset(['MAX'])
+
+
+def _reservedMap(reservedWords):
+    reserved = dict([(w, w.replace('-', '_').upper()) for w in reservedWords])
+
+    # hack to support SMIv1
+    reserved['Counter'] = 'COUNTER32'
+    reserved['Gauge'] = 'GAUGE32'
+
+    return reserved
+
+
+SMIV2_RESERVED = _reservedMap(SMIV2_RESERVED_WORDS)
+SMIV1_RESERVED = _reservedMap(SMIV1_RESERVED_WORDS)
+
+# keep token order stable across runs for Ply table signatures to match
+SMIV2_TOKENS = sorted(set(TOKENS + tuple(SMIV2_RESERVED.values())))
+SMIV1_TOKENS = sorted(set(TOKENS + tuple(SMIV1_RESERVED.values())))
+
 
 # Do not overload single lexer methods - overload all or none of them!
 # noinspection PySingleQuotedDocstring,PyMethodMayBeStatic,PyIncorrectDocstring
 class SmiV2Lexer(AbstractLexer):
-    reserved_words = [
-        'ACCESS', 'AGENT-CAPABILITIES', 'APPLICATION', 'AUGMENTS', 'BEGIN', 'BITS',
-        'CONTACT-INFO', 'CREATION-REQUIRES', 'Counter', 'Counter32', 'Counter64',
-        'DEFINITIONS', 'DEFVAL', 'DESCRIPTION', 'DISPLAY-HINT', 'END', 'ENTERPRISE',
-        'EXTENDS', 'FROM', 'GROUP', 'Gauge', 'Gauge32', 'IDENTIFIER', 'IMPLICIT',
-        'IMPLIED', 'IMPORTS', 'INCLUDES', 'INDEX', 'INSTALL-ERRORS', 'INTEGER',
-        'Integer32', 'IpAddress', 'LAST-UPDATED', 'MANDATORY-GROUPS',
-        'MAX-ACCESS', 'MIN-ACCESS', 'MODULE', 'MODULE-COMPLIANCE',
-        'MODULE-IDENTITY', 'NOTIFICATION-GROUP', 'NOTIFICATION-TYPE',
-        'NOTIFICATIONS', 'OBJECT', 'OBJECT-GROUP', 'OBJECT-IDENTITY', 'OBJECT-TYPE',
-        'OBJECTS', 'OCTET', 'OF', 'ORGANIZATION', 'Opaque', 'PIB-ACCESS',
-        'PIB-DEFINITIONS', 'PIB-INDEX', 'PIB-MIN-ACCESS', 'PIB-REFERENCES',
-        'PIB-TAG', 'POLICY-ACCESS', 'PRODUCT-RELEASE', 'REFERENCE', 'REVISION',
-        'SEQUENCE', 'SIZE', 'STATUS', 'STRING', 'SUBJECT-CATEGORIES', 'SUPPORTS',
-        'SYNTAX', 'TEXTUAL-CONVENTION', 'TimeTicks', 'TRAP-TYPE', 'UNIQUENESS',
-        'UNITS', 'UNIVERSAL', 'Unsigned32', 'VALUE', 'VARIABLES',
-        'VARIATION', 'WRITE-SYNTAX'
-    ]
-
-    reserved = {}
-    for w in reserved_words:
-        reserved[w] = w.replace('-', '_').upper()
-        # hack to support SMIv1
-        if w == 'Counter':
-            reserved[w] = 'COUNTER32'
-        elif w == 'Gauge':
-            reserved[w] = 'GAUGE32'
-
-    forbidden_words = [
-        'ABSENT', 'ANY', 'BIT', 'BOOLEAN', 'BY', 'COMPONENT', 'COMPONENTS',
-        'DEFAULT', 'DEFINED', 'ENUMERATED', 'EXPLICIT', 'EXTERNAL', 'FALSE', 'MAX',
-        'MIN', 'MINUS-INFINITY', 'NULL', 'OPTIONAL', 'PLUS-INFINITY', 'PRESENT',
-        'PRIVATE', 'REAL', 'SET', 'TAGS', 'TRUE', 'WITH'
-    ]
-
-    # Token names required!
-    tokens = list(set([
-                          'BIN_STRING',
-                          'CHOICE',
-                          'COLON_COLON_EQUAL',
-                          'DOT_DOT',
-                          'EXPORTS',
-                          'HEX_STRING',
-                          'LOWERCASE_IDENTIFIER',
-                          'MACRO',
-                          'NEGATIVENUMBER',
-                          'NEGATIVENUMBER64',
-                          'NUMBER',
-                          'NUMBER64',
-                          'QUOTED_STRING',
-                          'UPPERCASE_IDENTIFIER',
-                      ] + list(reserved.values())
-                      ))
+    reserved_words = list(SMIV2_RESERVED_WORDS)
+
+    reserved = SMIV2_RESERVED
+
+    forbidden_words = frozenset(SMIV2_FORBIDDEN_WORDS)
+
+    tokens = SMIV2_TOKENS
 
     states = (
         ('macro', 'exclusive'),
@@ -92,36 +116,71 @@ class SmiV2Lexer(AbstractLexer):
         self.reset()
 
     def reset(self):
+        # Building Ply lexer is costly (rules introspection and validation,
+        # master regexp compilation), so it is done once per lexer class.
+        # Each reset then gets a fresh clone of that lexer bound to us.
+        # Ply only logs while building, so the lexer is rebuilt whenever
+        # debug loggers have changed since.
+        loggers = self._getLoggers()
+
+        if ('_masterLexer' not in self.__class__.__dict__ or
+                self.__class__._masterLoggers != loggers):
+            self.__class__._masterLexer = self._buildLexer(*loggers)
+            self.__class__._masterLoggers = loggers
+
+        self.lexer = self._masterLexer.clone(self)
+
+    @staticmethod
+    def _getLoggers():
+        if debug.logger & debug.flagLexer:
+            logger = debug.logger.getCurrentLogger()
+        else:
+            logger = None
+
+        if debug.logger & debug.flagGrammar:
+            debuglogger = debug.logger.getCurrentLogger()
+        else:
+            debuglogger = None
+
+        return logger, debuglogger
+
+    def _buildLexer(self, logger=None, debuglogger=None):
         if LEX_VERSION < [3, 0]:
-            self.lexer = lex.lex(module=self,
-                                 reflags=re.DOTALL,
-                                 outputdir=self._tempdir,
-                                 debug=False)
+            return lex.lex(module=self,
+                           reflags=LEX_REFLAGS,
+                           outputdir=self._tempdir,
+                           debug=False)
         else:
-            if debug.logger & debug.flagLexer:
-                logger = debug.logger.getCurrentLogger()
-            else:
+            if logger is None:
                 logger = lex.NullLogger()
 
-            if debug.logger & debug.flagGrammar:
-                debuglogger = debug.logger.getCurrentLogger()
-            else:
-                debuglogger = None
-
-            self.lexer = lex.lex(module=self,
-                                 reflags=re.DOTALL,
-                                 outputdir=self._tempdir,
-                                 debuglog=debuglogger,
-                                 errorlog=logger)
+            return lex.lex(module=self,
+                           reflags=LEX_REFLAGS,
+                           outputdir=self._tempdir,
+                           debuglog=debuglogger,
+                           errorlog=logger)
 
     def t_newline(self, t):
         r'\r\n|\n|\r'
         t.lexer.lineno += 1
 
+    @staticmethod
+    def _skipUntil(lexer, marker):
+        # jump over a skipped section with plain substring search, leaving
+        # the closing marker to the state rules below
+        start = lexer.lexpos
+        end = lexer.lexdata.find(marker, start)
+
+        if end > start:
+            data = lexer.lexdata
+            lexer.lineno += data.count('\n', start, end) + data.count('\r', start, end) - data.count('\r\n', start, end)
+            lexer.lexpos = end
+
     # Skipping MACRO
     def t_MACRO(self, t):
         r'MACRO'
         t.lexer.begin('macro')
+        self._skipUntil(t.lexer, 'END')
         return t
 
     def t_macro_newline(self, t):
@@ -141,6 +200,7 @@ class SmiV2Lexer(AbstractLexer):
     def t_EXPORTS(self, t):
         r'EXPORTS'
         t.lexer.begin('exports')
+        self._skipUntil(t.lexer, ';')
         return t
 
     def t_exports_newline(self, t):
@@ -159,6 +219,7 @@ class SmiV2Lexer(AbstractLexer):
     def t_CHOICE(self, t):
         r'CHOICE'
         t.lexer.begin('choice')
+        self._skipUntil(t.lexer, '}')
         return t
 
     def t_choice_newline(self, t):
@@ -178,6 +239,19 @@ class SmiV2Lexer(AbstractLexer):
         r'--'
         t.lexer.begin('comment')
 
+        # jump to the end of line, the newline rule then leaves comment state
+        lexer = t.lexer
+        data = lexer.lexdata
+        end = data.find('\n', lexer.lexpos)
+        if end < 0:
+            end = len(data)
+
+        cr = data.find('\r', lexer.lexpos, end)
+        if cr >= 0:
+            end = cr
+
+        lexer.lexpos = end
+
     def t_comment_newline(self, t):
         r'\r\n|\n|\r'
         t.lexer.lineno += 1
@@ -193,13 +267,15 @@ class SmiV2Lexer(AbstractLexer):
 
     def t_UPPERCASE_IDENTIFIER(self, t):
         r'[A-Z][-a-zA-z0-9]*'
-        if t.value in self.forbidden_words:
-            raise error.PySmiLexerError("%s is forbidden" % t.value, lineno=t.lineno)
+        value = t.value
 
-        if t.value[-1] == '-':
-            raise error.PySmiLexerError("Identifier should not end with '-': %s" % t.value, lineno=t.lineno)
+        if value in self.forbidden_words:
+            raise error.PySmiLexerError("%s is forbidden" % value, lineno=t.lineno)
+
+        if value[-1] == '-':
+            raise error.PySmiLexerError("Identifier should not end with '-': %s" % value, lineno=t.lineno)
 
-        t.type = self.reserved.get(t.value, 'UPPERCASE_IDENTIFIER')
+        t.type = self.reserved.get(value, 'UPPERCASE_IDENTIFIER')
 
         return t
 
@@ -211,33 +287,32 @@ class SmiV2Lexer(AbstractLexer):
 
     def t_NUMBER(self, t):
         r'-?[0-9]+'
-        t.value = int(t.value)
-        neg = 0
-        if t.value < 0:
-            neg = 1
+        value = t.value = int(t.value)
 
-        val = abs(t.value)
-
-        if val <= UNSIGNED32_MAX:
-            if neg:
+        if value < 0:
+            if value >= -UNSIGNED32_MAX:
                 t.type = 'NEGATIVENUMBER'
 
-        elif val <= UNSIGNED64_MAX:
-            if neg:
+            elif value >= -UNSIGNED64_MAX:
                 t.type = 'NEGATIVENUMBER64'
+
             else:
+                raise error.PySmiLexerError("Number %s is too big" % value, lineno=t.lineno)
+
+        elif value > UNSIGNED32_MAX:
+            if value <= UNSIGNED64_MAX:
                 t.type = 'NUMBER64'
 
-        else:
-            raise error.PySmiLexerError("Number %s is too big" % t.value, lineno=t.lineno)
+            else:
+                raise error.PySmiLexerError("Number %s is too big" % value, lineno=t.lineno)
 
         return t
 
     def t_BIN_STRING(self, t):
         r'\'[01]*\'[bB]'
         value = t.value[1:-2]
-        while value and value[0] == '0' and len(value) % 8:
-            value = value[1:]
+        # drop up to the excess number of leading zeros in one slice
+        value = value[min(len(value) % 8, len(value) - len(value.lstrip('0'))):]
         # XXX raise in strict mode
         #    if len(value) % 8:
         #      raise error.PySmiLexerError("Number of 0s and 1s have to divide by 8 in binary string %s" % t.value, lineno=t.lineno)
@@ -246,8 +321,8 @@ class SmiV2Lexer(AbstractLexer):
     def t_HEX_STRING(self, t):
         r'\'[0-9a-fA-F]*\'[hH]'
         value = t.value[1:-2]
-        while value and value[0] == '0' and len(value) % 2:
-            value = value[1:]
+        # drop up to the excess number of leading zeros in one slice
+        value = value[min(len(value) % 2, len(value) - len(value.lstrip('0'))):]
         # XXX raise in strict mode
         #    if len(value) % 2:
         #      raise error.PySmiLexerError("Number of symbols have to be even in hex string %s" % t.value, lineno=t.lineno)
@@ -255,7 +330,9 @@ class SmiV2Lexer(AbstractLexer):
 
     def t_QUOTED_STRING(self, t):
         r'\"[^\"]*\"'
-        t.lexer.lineno += len(re.findall(r'\r\n|\n|\r', t.value))
+        # same as counting r'\r\n|\n|\r' matches, but without regexp machinery
+        value = t.value
+        t.lexer.lineno += value.count('\n') + value.count('\r') - value.count('\r\n')
         return t
 
     def t_error(self, t):
@@ -268,66 +345,15 @@ class SmiV2Lexer(AbstractLexer):
 class SupportSmiV1Keywords(object):
     @staticmethod
     def reserved():
-        reserved_words = [
-            'ACCESS', 'AGENT-CAPABILITIES', 'APPLICATION', 'AUGMENTS', 'BEGIN', 'BITS',
-            'CONTACT-INFO', 'CREATION-REQUIRES', 'Counter', 'Counter32', 'Counter64',
-            'DEFINITIONS', 'DEFVAL', 'DESCRIPTION', 'DISPLAY-HINT', 'END', 'ENTERPRISE',
-            'EXTENDS', 'FROM', 'GROUP', 'Gauge', 'Gauge32', 'IDENTIFIER', 'IMPLICIT',
-            'IMPLIED', 'IMPORTS', 'INCLUDES', 'INDEX', 'INSTALL-ERRORS', 'INTEGER',
-            'Integer32', 'IpAddress', 'LAST-UPDATED', 'MANDATORY-GROUPS',
-            'MAX-ACCESS', 'MIN-ACCESS', 'MODULE', 'MODULE-COMPLIANCE', 'MAX',
-            'MODULE-IDENTITY', 'NetworkAddress', 'NOTIFICATION-GROUP',
-            'NOTIFICATION-TYPE', 'NOTIFICATIONS', 'OBJECT', 'OBJECT-GROUP',
-            'OBJECT-IDENTITY', 'OBJECT-TYPE', 'OBJECTS', 'OCTET', 'OF', 'ORGANIZATION',
-            'Opaque', 'PIB-ACCESS', 'PIB-DEFINITIONS', 'PIB-INDEX', 'PIB-MIN-ACCESS',
-            'PIB-REFERENCES', 'PIB-TAG', 'POLICY-ACCESS', 'PRODUCT-RELEASE',
-            'REFERENCE', 'REVISION', 'SEQUENCE', 'SIZE', 'STATUS', 'STRING',
-            'SUBJECT-CATEGORIES', 'SUPPORTS', 'SYNTAX', 'TEXTUAL-CONVENTION',
-            'TimeTicks', 'TRAP-TYPE', 'UNIQUENESS', 'UNITS', 'UNIVERSAL', 'Unsigned32',
-            'VALUE', 'VARIABLES', 'VARIATION', 'WRITE-SYNTAX'
-        ]
-
-        reserved = {}
-        for w in reserved_words:
-            reserved[w] = w.replace('-', '_').upper()
-            # hack to support SMIv1
-            if w == 'Counter':
-                reserved[w] = 'COUNTER32'
-            elif w == 'Gauge':
-                reserved[w] = 'GAUGE32'
-
-        return reserved
+        return SMIV1_RESERVED
 
     @staticmethod
     def forbidden_words():
-        return [
-            'ABSENT', 'ANY', 'BIT', 'BOOLEAN', 'BY', 'COMPONENT', 'COMPONENTS',
-            'DEFAULT', 'DEFINED', 'ENUMERATED', 'EXPLICIT', 'EXTERNAL', 'FALSE',
-            'MIN', 'MINUS-INFINITY', 'NULL', 'OPTIONAL', 'PLUS-INFINITY', 'PRESENT',
-            'PRIVATE', 'REAL', 'SET', 'TAGS', 'TRUE', 'WITH'
-        ]
+        return SMIV1_FORBIDDEN_WORDS
 
     @staticmethod
     def tokens():
-        # Token names required!
-        tokens = [
-            'BIN_STRING',
-            'CHOICE',
-            'COLON_COLON_EQUAL',
-            'DOT_DOT',
-            'EXPORTS',
-            'HEX_STRING',
-            'LOWERCASE_IDENTIFIER',
-            'MACRO',
-            'NEGATIVENUMBER',
-            'NEGATIVENUMBER64',
-            'NUMBER',
-            'NUMBER64',
-            'QUOTED_STRING',
-            'UPPERCASE_IDENTIFIER',
-        ]
-        tokens += list(SupportSmiV1Keywords.reserved().values())
-        return list(set(tokens))
+        return SMIV1_TOKENS
 
 
 relaxedGrammar = {
@@ -347,18 +373,28 @@ relaxedGrammar = {
 }
 
 
+# lexer classes built so far, keyed by the set of enabled relaxation options
+_lexerClasses = {}
+
+
 def lexerFactory(**grammarOptions):
+    options = frozenset([option for option in grammarOptions if grammarOptions[option]])
+
+    if options in _lexerClasses:
+        return _lexerClasses[options]
+
     classAttr = {}
 
-    for option in grammarOptions:
-        if grammarOptions[option]:
-            if option not in relaxedGrammar:
-                raise error.PySmiError('Unknown lexer relaxation option: %s' % option)
+    for option in options:
+        if option not in relaxedGrammar:
+            raise error.PySmiError('Unknown lexer relaxation option: %s' % option)
+
+        for func in relaxedGrammar[option]:
+            if sys.version_info[0] > 2:
+                classAttr[func.__name__] = func()
+            else:
+                classAttr[func.func_name] = func()
 
-            for func in relaxedGrammar[option]:
-                if sys.version_info[0] > 2:
-                    classAttr[func.__name__] = func()
-                else:
-                    classAttr[func.func_name] = func()
+    lexerClass = _lexerClasses[options] = type('SmiLexer', (SmiV2Lexer,), classAttr)
 
-    return type('SmiLexer', (SmiV2Lexer,), classAttr)
+    return lexerClass
@@ -6,6 +6,7 @@
 #
 import sys
 import time
+import calendar
 import ftplib  # nosec
 from pysmi.reader.base import AbstractReader
 from pysmi.mibinfo import MibInfo
@@ -13,6 +14,8 @@ from pysmi.compat import decode
 from pysmi import error
 from pysmi import debug
 
+_FTP_ERRORS = ftplib.all_errors
+
 
 class FtpReader(AbstractReader):
     """Fetch ASN.1 MIB text by name from FTP server.
@@ -46,13 +49,30 @@ class FtpReader(AbstractReader):
         self._port = port
         self._user = user
         self._password = password
+        self._conn = None
         if '@mib@' not in locationTemplate:
             raise error.PySmiError('@mib@ placeholder not specified in location at %s' % self)
 
     def __str__(self):
         return '%s{"ftp://%s%s"}' % (self.__class__.__name__, self._host, self._locationTemplate)
 
-    def getData(self, mibname, **options):
+    def _connect(self):
+        # take over idle connection, if any, so that concurrent
+        # fetches never share one
+        conn, self._conn = self._conn, None
+
+        if conn is not None:
+            try:
+                conn.voidcmd('NOOP')
+
+            except _FTP_ERRORS:
+                debug.logger & debug.flagReader and debug.logger(
+                    'FTP server %s:%s dropped idle connection: %s' % (self._host, self._port, sys.exc_info()[1]))
+                conn.close()
+
+            else:
+                return conn
+
         if self._ssl:
             conn = ftplib.FTP_TLS()  # nosec
         else:
@@ -61,64 +81,95 @@ class FtpReader(AbstractReader):
         try:
             conn.connect(self._host, self._port, self._timeout)
 
-        except ftplib.all_errors:
+        except _FTP_ERRORS:
             raise error.PySmiReaderFileNotFoundError(
                 'failed to connect to FTP server %s:%s: %s' % (self._host, self._port, sys.exc_info()[1]), reader=self)
 
         try:
             conn.login(self._user, self._password)
 
-        except ftplib.all_errors:
+        except _FTP_ERRORS:
             conn.close()
             raise error.PySmiReaderFileNotFoundError('failed to log in to FTP server %s:%s as %s/%s: %s' % (self._host, self._port, self._user, self._password, sys.exc_info()[1]), reader=self)
 
+        return conn
+
+    def _release(self, conn):
+        # keep one connection around for subsequent fetches
+        if self._conn is None:
+            self._conn = conn
+        else:
+            conn.close()
+
+    def close(self):
+        """Close idle FTP connection kept open between *getData* calls"""
+        conn, self._conn = self._conn, None
+
+        if conn is not None:
+            conn.close()
+
+    def getData(self, mibname, **options):
+        dbg = debug.logger & debug.flagReader
+
+        conn = self._connect()
+
         mibname = decode(mibname)
 
-        debug.logger & debug.flagReader and debug.logger('looking for MIB %s' % mibname)
+        dbg and debug.logger('looking for MIB %s' % mibname)
 
         for mibalias, mibfile in self.getMibVariants(mibname, **options):
             location = self._locationTemplate.replace('@mib@', mibfile)
 
             mtime = time.time()
 
-            debug.logger & debug.flagReader and debug.logger(
+            dbg and debug.logger(
                 'trying to fetch MIB %s from %s:%s' % (location, self._host, self._port))
 
-            data = []
+            data = bytearray()
 
             try:
                 try:
                     response = conn.sendcmd('MDTM %s' % location)
 
-                except ftplib.all_errors:
-                    debug.logger & debug.flagReader and debug.logger(
+                except _FTP_ERRORS:
+                    dbg and debug.logger(
                         'server %s:%s does not support MDTM command, fetching file %s' % (
                         self._host, self._port, location))
 
                 else:
-                    debug.logger & debug.flagReader and debug.logger(
+                    dbg and debug.logger(
                         'server %s:%s MDTM response is %s' % (self._host, self._port, response))
 
-                    if response[:3] == 213:
-                        mtime = time.mktime(time.strptime(response[4:], "%Y%m%d%H%M%S"))
+                    if response[:3] == '213':
+                        # MDTM reports UTC time as YYYYMMDDHHMMSS[.sss]
+                        timestamp = response[4:18]
 
-                debug.logger & debug.flagReader and debug.logger('fetching source MIB %s, mtime %s' % (location, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(mtime))))
+                        try:
+                            mtime = calendar.timegm(
+                                (int(timestamp[:4]), int(timestamp[4:6]), int(timestamp[6:8]),
+                                 int(timestamp[8:10]), int(timestamp[10:12]), int(timestamp[12:14]), 0, 0, 0))
 
-                conn.retrlines('RETR %s' % location, lambda x, y=data: y.append(x))
+                        except ValueError:
+                            dbg and debug.logger(
+                                'server %s:%s MDTM response is malformed: %s' % (self._host, self._port, response))
 
-            except ftplib.all_errors:
-                debug.logger & debug.flagReader and debug.logger(
+                dbg and debug.logger('fetching source MIB %s, mtime %s' % (location, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(mtime))))
+
+                conn.retrbinary('RETR %s' % location, data.extend)
+
+            except _FTP_ERRORS:
+                dbg and debug.logger(
                     'failed to fetch MIB %s from %s:%s: %s' % (location, self._host, self._port, sys.exc_info()[1]))
                 continue
 
-            data = decode('\n'.join(data))
+            data = decode(bytes(data))
 
-            debug.logger & debug.flagReader and debug.logger('fetched %s bytes in %s' % (len(data), location))
+            dbg and debug.logger('fetched %s bytes in %s' % (len(data), location))
 
-            conn.close()
+            self._release(conn)
 
             return MibInfo(path='ftp://%s%s' % (self._host, location), file=mibfile, name=mibalias, mtime=mtime), data
 
-        conn.close()
+        self._release(conn)
 
         raise error.PySmiReaderFileNotFoundError('source MIB %s not found' % mibname, reader=self)
@@ -6,13 +6,46 @@
 #
 import os
 import sys
+import stat
 import time
+import atexit
+import weakref
+import tempfile
+import threading
+try:
+    from os import scandir
+
+except ImportError:
+    scandir = None
+
+try:
+    import json
+
+except ImportError:
+    import simplejson as json
+
 from pysmi.reader.base import AbstractReader
 from pysmi.mibinfo import MibInfo
-from pysmi.compat import decode
+from pysmi.compat import decode, encode
 from pysmi import debug
 from pysmi import error
 
+# parsed .index files shared by readers, keyed by path
+_indexCache = {}
+_indexCacheLock = threading.Lock()
+
+# serializes updates of MIB resolution cache files
+_resolveCacheLock = threading.Lock()
+
+# readers holding MIB locations not yet stored in their cache files
+_pendingReaders = weakref.WeakSet()
+
+
+@atexit.register
+def _storeResolveCaches():
+    for reader in list(_pendingReaders):
+        reader.close()
+
 
 class FileReader(AbstractReader):
     """Fetch ASN.1 MIB text by name from local file.
@@ -22,6 +55,7 @@ class FileReader(AbstractReader):
     """
     useIndexFile = True  # optional .index file mapping MIB to file name
     indexFile = '.index'
+    resolveCacheFile = None  # optional JSON file remembering where MIBs were found
 
     def __init__(self, path, recursive=True, ignoreErrors=True):
         """Create an instance of *FileReader* serving a directory.
@@ -38,6 +72,10 @@ class FileReader(AbstractReader):
         self._ignoreErrors = ignoreErrors
         self._indexLoaded = False
         self._mibIndex = None
+        self._subdirs = None
+        self._dirIndex = {}
+        self._resolved = None
+        self._resolvedChanged = False
 
     def __str__(self):
         return '%s{"%s"}' % (self.__class__.__name__, self._path)
@@ -46,41 +84,97 @@ class FileReader(AbstractReader):
         if not recursive:
             return [path]
 
-        dirs = [path]
+        dirs = []
+
+        # depth-first, each directory followed by its subtree
+        stack = [path]
+
+        while stack:
+            path = stack.pop()
+
+            dirs.append(path)
 
+            try:
+                if scandir:
+                    # directory entries carry file type, sparing stat() calls
+                    subdirs = [entry.path for entry in scandir(path) if entry.is_dir()]
+
+                else:
+                    subdirs = [d for d in [os.path.join(path, x) for x in os.listdir(path)] if os.path.isdir(d)]
+
+            except OSError:
+                # errors below top directory have always been ignored
+                if ignoreErrors or len(dirs) > 1:
+                    continue
+
+                else:
+                    raise error.PySmiError('directory %s access error: %s' % (path, sys.exc_info()[1]))
+
+            stack.extend([decode(d) for d in reversed(subdirs)])
+
+        return dirs
+
+    def _listDir(self, path):
+        # lowercased directory entry names, re-read whenever directory changes
         try:
-            subdirs = os.listdir(path)
+            mtime = os.stat(path).st_mtime
 
         except OSError:
-            if ignoreErrors:
-                return dirs
+            return
 
-            else:
-                raise error.PySmiError('directory %s access error: %s' % (path, sys.exc_info()[1]))
+        if path in self._dirIndex:
+            indexTime, names = self._dirIndex[path]
+            if indexTime == mtime:
+                return names
 
-        for d in subdirs:
-            d = os.path.join(decode(path), decode(d))
-            if os.path.isdir(d):
-                dirs.extend(self.getSubdirs(d, recursive))
+        try:
+            names = frozenset([decode(x).lower() for x in os.listdir(path)])
 
-        return dirs
+        except OSError:
+            return
+
+        self._dirIndex[path] = mtime, names
+
+        return names
 
     @staticmethod
     def loadIndex(indexFile):
-        mibIndex = {}
-        if os.path.exists(indexFile):
+        try:
+            st = os.stat(indexFile)
+
+        except OSError:
+            return {}
+
+        indexFile = os.path.abspath(indexFile)
+
+        # size catches rewrites within file system timestamp granularity
+        signature = st.st_mtime, st.st_size
+
+        with _indexCacheLock:
+            if indexFile in _indexCache:
+                cachedSignature, mibIndex = _indexCache[indexFile]
+                if cachedSignature == signature:
+                    return mibIndex
+
+            mibIndex = {}
+
             try:
                 f = open(indexFile)
+                data = f.read()
+                f.close()
+
+                # MIB name and file name, ignoring the rest of the line
                 mibIndex = dict(
-                    [x.split()[:2] for x in f.readlines()]
+                    [x[:2] for x in [line.split(None, 2) for line in data.splitlines()] if len(x) > 1]
                 )
-                f.close()
                 debug.logger & debug.flagReader and debug.logger(
                     'loaded MIB index map from %s file, %s entries' % (indexFile, len(mibIndex)))
 
             except IOError:
                 pass
 
+            _indexCache[indexFile] = signature, mibIndex
+
         return mibIndex
 
     def getMibVariants(self, mibname, **options):
@@ -98,40 +192,187 @@ class FileReader(AbstractReader):
 
         return super(FileReader, self).getMibVariants(mibname, **options)
 
+    def _loadResolveCache(self):
+        try:
+            with open(self.resolveCacheFile) as f:
+                return json.load(f)
+
+        except Exception:
+            return {}
+
+    def _storeResolveCache(self):
+        cacheDir = os.path.dirname(os.path.abspath(self.resolveCacheFile))
+
+        tfile = None
+
+        with _resolveCacheLock:
+            # merge with what other readers may have stored meanwhile
+            resolveCache = self._loadResolveCache()
+            resolveCache.setdefault(self._path, {}).update(self._resolved)
+
+            try:
+                if not os.path.exists(cacheDir):
+                    os.makedirs(cacheDir)
+
+                fd, tfile = tempfile.mkstemp(dir=cacheDir)
+                os.write(fd, encode(json.dumps(resolveCache)))
+                os.close(fd)
+
+                # atomic, replacing existing file where platform allows
+                getattr(os, 'replace', os.rename)(tfile, self.resolveCacheFile)
+
+            except Exception:
+                debug.logger & debug.flagReader and debug.logger(
+                    'failed to store MIB resolution cache at %s: %s' % (self.resolveCacheFile, sys.exc_info()[1]))
+
+                if tfile and os.access(tfile, os.F_OK):
+                    os.unlink(tfile)
+
+    def _statResolved(self, resolved, mibVariants):
+        try:
+            f, mibalias, mibfile, mtime, variants, dirs = resolved
+
+        except ValueError:
+            return
+
+        if [tuple(x) for x in variants] != mibVariants:
+            return
+
+        # subdirectories are out of non-recursive reader reach
+        if not self._recursive and len(dirs) > 1:
+            return
+
+        try:
+            # files added to or removed from directories searched before
+            # the MIB was found would change its resolution
+            for path, dirMtime in dirs:
+                if os.stat(path).st_mtime != dirMtime:
+                    return
+
+            st = os.stat(f)
+
+        except OSError:
+            return
+
+        if stat.S_ISREG(st.st_mode) and st[stat.ST_MTIME] == mtime:
+            return st
+
+    def invalidate(self):
+        """Forget directory tree and MIB index read so far.
+
+        The directory tree is walked once per reader. Call this method
+        to let a long-lived reader notice new subdirectories.
+        """
+        self._subdirs = None
+        self._dirIndex.clear()
+        self._indexLoaded = False
+
+    def close(self):
+        """Store MIB locations found since reader creation or last call."""
+        if self._resolvedChanged:
+            self._resolvedChanged = False
+            _pendingReaders.discard(self)
+
+            self._storeResolveCache()
+
+    def _readMib(self, f, st, mibalias, mibfile):
+        try:
+            mtime = st[stat.ST_MTIME]
+
+            debug.logger & debug.flagReader and debug.logger(
+                'source MIB %s mtime is %s, fetching data...' % (
+                    f, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(mtime))))
+
+            # read just as much as stat() reported, sparing maxMibSize-long
+            # buffer allocation and Python file object
+            fd = os.open(f, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+
+            try:
+                mibData = os.read(fd, min(st[stat.ST_SIZE] or self.maxMibSize, self.maxMibSize))
+
+            finally:
+                os.close(fd)
+
+            if len(mibData) == self.maxMibSize:
+                raise IOError('MIB %s too large' % f)
+
+            return MibInfo(path='file://%s' % f, file=mibfile, name=mibalias, mtime=mtime), decode(mibData)
+
+        except (OSError, IOError):
+            debug.logger & debug.flagReader and debug.logger(
+                'source file %s open failure: %s' % (f, sys.exc_info()[1]))
+
+            if not self._ignoreErrors:
+                raise error.PySmiError('file %s access error: %s' % (f, sys.exc_info()[1]))
+
     def getData(self, mibname, **options):
         debug.logger & debug.flagReader and debug.logger(
             '%slooking for MIB %s' % (self._recursive and 'recursively ' or '', mibname))
 
-        for path in self.getSubdirs(self._path, self._recursive, self._ignoreErrors):
+        mibname = decode(mibname)
 
-            for mibalias, mibfile in self.getMibVariants(mibname, **options):
-                f = os.path.join(decode(path), decode(mibfile))
+        # file name variants do not depend on directory
+        mibVariants = list(self.getMibVariants(mibname, **options))
 
-                debug.logger & debug.flagReader and debug.logger('trying MIB %s' % f)
+        if self.resolveCacheFile:
+            if self._resolved is None:
+                self._resolved = self._loadResolveCache().get(self._path, {})
+
+            resolved = self._resolved.get(mibname)
+            if resolved:
+                st = self._statResolved(resolved, mibVariants)
+                if st is not None:
+                    f, mibalias, mibfile = resolved[:3]
+
+                    debug.logger & debug.flagReader and debug.logger('MIB %s resolved from cache' % f)
+
+                    mibData = self._readMib(f, st, mibalias, mibfile)
+                    if mibData:
+                        return mibData
+
+        searched = []
+
+        # directory tree is walked once per reader, like .index is read once
+        if self._subdirs is None:
+            self._subdirs = [decode(path) for path in self.getSubdirs(self._path, self._recursive, self._ignoreErrors)]
 
-                if os.path.exists(f) and os.path.isfile(f):
-                    try:
-                        mtime = os.stat(f)[8]
+        for path in self._subdirs:
+            # joining with empty name adds separator only where needed
+            prefix = os.path.join(path, '')
 
-                        debug.logger & debug.flagReader and debug.logger(
-                            'source MIB %s mtime is %s, fetching data...' % (
-                                f, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(mtime))))
+            # case-insensitive match still needs stat() to confirm, but
+            # files missing from directory listing need not be probed at all
+            names = self._listDir(path)
 
-                        fp = open(f, mode='rb')
-                        mibData = fp.read(self.maxMibSize)
-                        fp.close()
+            if names is None:
+                searched = None
+
+            elif searched is not None:
+                searched.append((path, self._dirIndex[path][0]))
+
+            for mibalias, mibfile in mibVariants:
+                if names is not None and mibfile.lower() not in names and not os.path.dirname(mibfile):
+                    continue
+
+                f = prefix + mibfile
+
+                debug.logger & debug.flagReader and debug.logger('trying MIB %s' % f)
 
-                        if len(mibData) == self.maxMibSize:
-                            raise IOError('MIB %s too large' % f)
+                try:
+                    st = os.stat(f)
 
-                        return MibInfo(path='file://%s' % f, file=mibfile, name=mibalias, mtime=mtime), decode(mibData)
+                except OSError:
+                    continue
 
-                    except (OSError, IOError):
-                        debug.logger & debug.flagReader and debug.logger(
-                            'source file %s open failure: %s' % (f, sys.exc_info()[1]))
+                if stat.S_ISREG(st.st_mode):
+                    mibData = self._readMib(f, st, mibalias, mibfile)
+                    if mibData:
+                        if self.resolveCacheFile and searched is not None:
+                            self._resolved[mibname] = f, mibalias, mibfile, mibData[0].mtime, mibVariants, searched
+                            self._resolvedChanged = True
+                            _pendingReaders.add(self)
 
-                        if not self._ignoreErrors:
-                            raise error.PySmiError('file %s access error: %s' % (f, sys.exc_info()[1]))
+                        return mibData
 
                     raise error.PySmiReaderFileNotModifiedError('source MIB %s is older than needed' % f, reader=self)
 
@@ -23,6 +23,37 @@ from pysmi.reader.ftpclient import FtpReader
 from pysmi import error
 
 
+def _makeFileReader(mibSource):
+    filePath = url2pathname(mibSource.path)
+    if mibSource.scheme != 'file' and filePath.lower().endswith('.zip'):
+        return ZipReader(filePath)
+
+    return FileReader(filePath)
+
+
+def _makeHttpReader(mibSource):
+    return HttpReader(mibSource.hostname or mibSource.netloc, mibSource.port or 80, mibSource.path,
+                      ssl=mibSource.scheme == 'https')
+
+
+def _makeFtpReader(mibSource):
+    return FtpReader(mibSource.hostname or mibSource.netloc, mibSource.path, ssl=mibSource.scheme == 'sftp',
+                     port=mibSource.port or 21, user=mibSource.username or 'anonymous',
+                     password=mibSource.password or 'anonymous@')
+
+
+# URL scheme to reader factory
+_SCHEME_HANDLERS = {
+    '': _makeFileReader,
+    'file': _makeFileReader,
+    'zip': _makeFileReader,
+    'http': _makeHttpReader,
+    'https': _makeHttpReader,
+    'ftp': _makeFtpReader,
+    'sftp': _makeFtpReader
+}
+
+
 def getReadersFromUrls(*sourceUrls, **options):
     readers = []
     for sourceUrl in sourceUrls:
@@ -44,32 +75,10 @@ def getReadersFromUrls(*sourceUrls, **options):
 
                 setattr(mibSource, k, v)
 
-        if mibSource.scheme in ('', 'file', 'zip'):
-            scheme = mibSource.scheme
-            filePath = url2pathname(mibSource.path)
-            if scheme != 'file' and (filePath.endswith('.zip') or
-                                     filePath.endswith('.ZIP')):
-                scheme = 'zip'
-
-            else:
-                scheme = 'file'
-
-            if scheme == 'file':
-                readers.append(FileReader(filePath).setOptions(**options))
-            else:
-                readers.append(ZipReader(filePath).setOptions(**options))
-
-        elif mibSource.scheme in ('http', 'https'):
-            readers.append(HttpReader(mibSource.hostname or mibSource.netloc, mibSource.port or 80, mibSource.path,
-                                      ssl=mibSource.scheme == 'https').setOptions(**options))
-
-        elif mibSource.scheme in ('ftp', 'sftp'):
-            readers.append(
-                FtpReader(mibSource.hostname or mibSource.netloc, mibSource.path, ssl=mibSource.scheme == 'sftp',
-                          port=mibSource.port or 21, user=mibSource.username or 'anonymous',
-                          password=mibSource.password or 'anonymous@').setOptions(**options))
-
-        else:
+        handler = _SCHEME_HANDLERS.get(mibSource.scheme)
+        if handler is None:
             raise error.PySmiError('Unsupported URL scheme %s' % sourceUrl)
 
+        readers.append(handler(mibSource).setOptions(**options))
+
     return readers
@@ -5,9 +5,9 @@
 # License: http://snmplabs.com/pysmi/license.html
 #
 import os
+import io
 import sys
 import time
-import datetime
 import zipfile
 from pysmi.reader.base import AbstractReader
 from pysmi.mibinfo import MibInfo
@@ -16,55 +16,11 @@ from pysmi import debug
 from pysmi import error
 
 
-class FileLike(object):
-    """Stripped down, binary file mock to work with ZipFile"""
+class FileLike(io.BytesIO):
+    """In-memory binary file carrying a name to work with ZipFile"""
     def __init__(self, buf, name):
+        io.BytesIO.__init__(self, buf)
         self.name = name
-        self.buf = buf
-        self.null = buf[:0]
-        self.len = len(buf)
-        self.buflist = []
-        self.pos = 0
-        self.closed = False
-        self.softspace = 0
-
-    def close(self):
-        if not self.closed:
-            self.closed = True
-            self.buf = self.null
-            self.pos = 0
-
-    def seek(self, pos, mode = 0):
-        if self.buflist:
-            self.buf += self.null.join(self.buflist)
-            self.buflist = []
-
-        if mode == 1:
-            pos += self.pos
-
-        elif mode == 2:
-            pos += self.len
-
-        self.pos = max(0, pos)
-
-    def tell(self):
-        return self.pos
-
-    def read(self, n=-1):
-        if self.buflist:
-            self.buf += self.null.join(self.buflist)
-            self.buflist = []
-
-        if n < 0:
-            newpos = self.len
-        else:
-            newpos = min(self.pos + n, self.len)
-
-        r = self.buf[self.pos:newpos]
-
-        self.pos = newpos
-
-        return r
 
 
 class ZipReader(AbstractReader):
@@ -86,10 +42,15 @@ class ZipReader(AbstractReader):
         """
         self._name = path
         self._members = {}
+        self._membersNoCase = {}
         self._pendingError = None
 
         try:
-            self._members = self._readZipDirectory(fileObj=open(path, 'rb'))
+            self._members = self._readZipDirectory(fileObj=path)
+
+            # fallback for file names differing from MIB name variants in case only
+            for filename in sorted(self._members):
+                self._membersNoCase.setdefault(filename.lower(), self._members[filename])
 
         except Exception:
             debug.logger & debug.flagReader and debug.logger(
@@ -99,14 +60,15 @@ class ZipReader(AbstractReader):
                 self._pendingError = error.PySmiError('file %s access error: %s' % (self._name, sys.exc_info()[1]))
 
     def _readZipDirectory(self, fileObj):
-
+        # archives stay open for the reader lifetime so that central
+        # directories are parsed just once
         archive = zipfile.ZipFile(fileObj)
 
-        if isinstance(fileObj, FileLike):
-            fileObj = None
-
         members = {}
 
+        # number of '+' last appended to each duplicate file name
+        suffixes = {}
+
         for member in archive.infolist():
 
             filename = os.path.basename(member.filename)
@@ -122,36 +84,44 @@ class ZipReader(AbstractReader):
 
                 for innerFilename, ref in innerMembers.items():
 
-                    while innerFilename in members:
-                        innerFilename += '+'
+                    # resume probing where previous duplicate stopped
+                    uniqueFilename = innerFilename + '+' * suffixes.get(innerFilename, 0)
+
+                    while uniqueFilename in members:
+                        uniqueFilename += '+'
+
+                    suffixes[innerFilename] = len(uniqueFilename) - len(innerFilename)
 
-                    members[innerFilename] = [[fileObj, member.filename, None]]
-                    members[innerFilename].extend(ref)
+                    members[uniqueFilename] = ref
 
             else:
-                mtime = time.mktime(datetime.datetime(*member.date_time[:6]).timetuple())
+                # ZIP keeps local time, let mktime() figure out DST
+                mtime = time.mktime(member.date_time + (0, 0, -1))
 
-                members[filename] = [[fileObj, member.filename, mtime]]
+                members[filename] = archive, member.filename, mtime
 
         return members
 
-    def _readZipFile(self, refs):
+    def _readZipFile(self, ref):
 
-        for fileObj, filename, mtime in refs:
+        archive, filename, mtime = ref
 
-            if not fileObj:
-                fileObj = FileLike(dataObj, name=self._name)
+        try:
+            return archive.read(filename), mtime
 
-            archive = zipfile.ZipFile(fileObj)
+        except Exception:
+            debug.logger & debug.flagReader and debug.logger('ZIP read component %s read error: %s' % (archive.filename, sys.exc_info()[1]))
+            return '', 0
 
-            try:
-                dataObj = archive.read(filename)
+    def close(self):
+        """Close ZIP archive kept open by *ZipReader*"""
+        archives = set([archive for archive, filename, mtime in self._members.values()])
 
-            except Exception:
-                debug.logger & debug.flagReader and debug.logger('ZIP read component %s read error: %s' % (fileObj.name, sys.exc_info()[1]))
-                return '', 0
+        self._members = {}
+        self._membersNoCase = {}
 
-        return dataObj, mtime
+        for archive in archives:
+            archive.close()
 
     def __str__(self):
         return '%s{"%s"}' % (self.__class__.__name__, self._name)
@@ -169,13 +139,11 @@ class ZipReader(AbstractReader):
 
             debug.logger & debug.flagReader and debug.logger('trying MIB %s' % mibfile)
 
-            try:
-                refs = self._members[mibfile]
-
-            except KeyError:
+            ref = self._members.get(mibfile) or self._membersNoCase.get(mibfile.lower())
+            if not ref:
                 continue
 
-            mibData, mtime = self._readZipFile(refs)
+            mibData, mtime = self._readZipFile(ref)
 
             if not mibData:
                 continue
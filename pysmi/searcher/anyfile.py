@@ -5,7 +5,7 @@
 # License: http://snmplabs.com/pysmi/license.html
 #
 import os
-import sys
+import stat
 import time
 from pysmi.searcher.base import AbstractSearcher
 from pysmi.compat import decode
@@ -39,16 +39,18 @@ class AnyFileSearcher(AbstractSearcher):
 
         for sfx in self.exts:
             f = basename + sfx
-            if not os.path.exists(f) or not os.path.isfile(f):
-                debug.logger & debug.flagSearcher and debug.logger('%s not present or not a file' % f)
-                continue
 
             try:
-                fileTime = os.stat(f)[8]
+                st = os.stat(f)
 
             except OSError:
-                raise error.PySmiSearcherError('failure opening compiled file %s: %s' % (f, sys.exc_info()[1]),
-                                               searcher=self)
+                st = None
+
+            if st is None or not stat.S_ISREG(st.st_mode):
+                debug.logger & debug.flagSearcher and debug.logger('%s not present or not a file' % f)
+                continue
+
+            fileTime = st[stat.ST_MTIME]
 
             debug.logger & debug.flagSearcher and debug.logger(
                 'found %s, mtime %s' % (f, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(fileTime))))
@@ -6,18 +6,13 @@
 #
 import os
 import sys
+import stat
 import time
 import struct
 try:
-    import importlib
-
-    try:
-        PY_MAGIC_NUMBER = importlib.util.MAGIC_NUMBER
-        SOURCE_SUFFIXES = importlib.machinery.SOURCE_SUFFIXES
-        BYTECODE_SUFFIXES = importlib.machinery.BYTECODE_SUFFIXES
-
-    except Exception:
-        raise ImportError()
+    # submodules are imported explicitly, importlib alone does not load them
+    from importlib.util import MAGIC_NUMBER as PY_MAGIC_NUMBER
+    from importlib.machinery import SOURCE_SUFFIXES, BYTECODE_SUFFIXES
 
 except ImportError:
     import imp
@@ -28,6 +23,10 @@ except ImportError:
     BYTECODE_SUFFIXES = [s[0] for s in imp.get_suffixes()
                          if s[2] == imp.PY_COMPILED]
 
+# bytecode header is magic, [flags,] source mtime, [source size]
+PY_TIME_OFFSET = sys.version_info[:2] >= (3, 7) and 8 or 4
+PY_TIME_STRUCT = struct.Struct('<L')
+
 from pysmi.searcher.base import AbstractSearcher
 from pysmi.compat import decode
 from pysmi import debug
@@ -60,21 +59,31 @@ class PyFileSearcher(AbstractSearcher):
         for pySfx in BYTECODE_SUFFIXES:
             f = pyfile + pySfx
 
-            if not os.path.exists(f) or not os.path.isfile(f):
+            try:
+                st = os.stat(f)
+
+            except OSError:
+                st = None
+
+            if st is None or not stat.S_ISREG(st.st_mode):
                 debug.logger & debug.flagSearcher and debug.logger('%s not present or not a file' % f)
                 continue
 
             try:
                 fp = open(f, 'rb')
-                pyData = fp.read(8)
+                pyData = fp.read(PY_TIME_OFFSET + PY_TIME_STRUCT.size)
                 fp.close()
 
             except IOError:
                 raise error.PySmiSearcherError('failure opening compiled file %s: %s' % (f, sys.exc_info()[1]),
                                                searcher=self)
-            if pyData[:4] == PY_MAGIC_NUMBER:
-                pyData = pyData[4:]
-                pyTime = struct.unpack('<L', pyData[:4])[0]
+            if pyData[:4] == PY_MAGIC_NUMBER and len(pyData) == PY_TIME_OFFSET + PY_TIME_STRUCT.size:
+                # PEP 552 hash-based bytecode carries no source mtime
+                if PY_TIME_OFFSET > 4 and PY_TIME_STRUCT.unpack_from(pyData, 4)[0] & 1:
+                    debug.logger & debug.flagSearcher and debug.logger('%s is hash-based, skipping' % f)
+                    continue
+
+                pyTime = PY_TIME_STRUCT.unpack_from(pyData, PY_TIME_OFFSET)[0]
                 debug.logger & debug.flagSearcher and debug.logger(
                     'found %s, mtime %s' % (f, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(pyTime))))
                 if pyTime >= mtime:
@@ -90,16 +99,17 @@ class PyFileSearcher(AbstractSearcher):
         for pySfx in SOURCE_SUFFIXES:
             f = pyfile + pySfx
 
-            if not os.path.exists(f) or not os.path.isfile(f):
-                debug.logger & debug.flagSearcher and debug.logger('%s not present or not a file' % f)
-                continue
-
             try:
-                pyTime = os.stat(f)[8]
+                st = os.stat(f)
 
             except OSError:
-                raise error.PySmiSearcherError('failure opening compiled file %s: %s' % (f, sys.exc_info()[1]),
-                                               searcher=self)
+                st = None
+
+            if st is None or not stat.S_ISREG(st.st_mode):
+                debug.logger & debug.flagSearcher and debug.logger('%s not present or not a file' % f)
+                continue
+
+            pyTime = st[stat.ST_MTIME]
 
             debug.logger & debug.flagSearcher and debug.logger(
                 'found %s, mtime %s' % (f, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(pyTime))))
@@ -5,30 +5,13 @@
 # License: http://snmplabs.com/pysmi/license.html
 #
 import os
+import sys
 import time
-import struct
-try:
-    import importlib
-
-    try:
-        PY_MAGIC_NUMBER = importlib.util.MAGIC_NUMBER
-        SOURCE_SUFFIXES = importlib.machinery.SOURCE_SUFFIXES
-        BYTECODE_SUFFIXES = importlib.machinery.BYTECODE_SUFFIXES
-
-    except Exception:
-        raise ImportError()
-
-except ImportError:
-    import imp
-
-    PY_MAGIC_NUMBER = imp.get_magic()
-    SOURCE_SUFFIXES = [s[0] for s in imp.get_suffixes()
-                       if s[2] == imp.PY_SOURCE]
-    BYTECODE_SUFFIXES = [s[0] for s in imp.get_suffixes()
-                         if s[2] == imp.PY_COMPILED]
-
+import zipfile
+import zipimport
 from pysmi.searcher.base import AbstractSearcher
 from pysmi.searcher.pyfile import PyFileSearcher
+from pysmi.searcher.pyfile import PY_MAGIC_NUMBER, BYTECODE_SUFFIXES, SOURCE_SUFFIXES, PY_TIME_OFFSET, PY_TIME_STRUCT
 from pysmi.compat import decode
 from pysmi import debug
 from pysmi import error
@@ -49,23 +32,73 @@ class PyPackageSearcher(AbstractSearcher):
                               modules at.
         """
         self._package = package
-        self.__loader = None
+        self.__archive = None
+        self.__resolved = False
+        self.__pyFileSearcher = None
+        self.__importError = None
+        self.__members = None
 
     def __str__(self):
         return '%s{"%s"}' % (self.__class__.__name__, self._package)
 
-    @staticmethod
-    def _parseDosTime(dosdate, dostime):
-        t = (((dosdate >> 9) & 0x7f) + 1980,  # year
-             ((dosdate >> 5) & 0x0f),  # month
-             dosdate & 0x1f,  # mday
-             (dostime >> 11) & 0x1f,  # hour
-             (dostime >> 5) & 0x3f,  # min
-             (dostime & 0x1f) * 2,  # sec
-             -1,  # wday
-             -1,  # yday
-             -1)  # dst
-        return time.mktime(t)
+    def _resolvePackage(self):
+        # package location does not change, import it just once
+        self.__resolved = True
+
+        try:
+            # already imported package is taken as is
+            p = sys.modules.get(self._package)
+            if p is None:
+                __import__(self._package)
+                p = sys.modules[self._package]
+
+        except ImportError:
+            self.__importError = '%s is not importable, trying as a path' % self._package
+            return
+
+        loader = getattr(p, '__loader__', None)
+
+        if isinstance(loader, zipimport.zipimporter):
+            try:
+                self.__archive = zipfile.ZipFile(loader.archive)
+
+            except (IOError, zipfile.BadZipfile):
+                self.__importError = 'egg %s of %s can not be opened: %s' % (
+                    loader.archive, self._package, sys.exc_info()[1])
+                return
+
+            # package directory inside archive, always '/'-separated
+            prefix = os.path.dirname(p.__file__)[len(loader.archive) + 1:].replace(os.sep, '/') + '/'
+
+            # package directory members by upper-cased base name
+            self.__members = dict([(info.filename[len(prefix):].upper(), info)
+                                   for info in sorted(self.__archive.infolist(), key=lambda x: x.filename,
+                                                      reverse=True)
+                                   if info.filename.startswith(prefix) and '/' not in info.filename[len(prefix):]])
+
+            self._package = self._package.replace('.', os.sep)
+
+            debug.logger & debug.flagSearcher and debug.logger(
+                '%s is an importable egg at %s' % (self._package, os.path.split(p.__file__)[0]))
+
+        elif hasattr(p, '__file__'):
+            debug.logger & debug.flagSearcher and debug.logger(
+                '%s is not an egg, trying it as a package directory' % self._package)
+            self.__pyFileSearcher = PyFileSearcher(os.path.split(p.__file__)[0])
+
+        else:
+            self.__importError = '%s is neither importable nor a file' % self._package
+
+    def close(self):
+        """Close egg archive, if any, the searcher has opened."""
+        if self.__archive is not None:
+            self.__archive.close()
+            self.__archive = None
+
+        self.__resolved = False
+        self.__pyFileSearcher = None
+        self.__importError = None
+        self.__members = None
 
     def fileExists(self, mibname, mtime, rebuild=False):
         if rebuild:
@@ -74,37 +107,44 @@ class PyPackageSearcher(AbstractSearcher):
 
         mibname = decode(mibname)
 
-        try:
-            p = __import__(self._package, globals(), locals(), ['__init__'])
+        if not self.__resolved:
+            self._resolvePackage()
 
-            if hasattr(p, '__loader__') and hasattr(p.__loader__, '_files'):
-                self.__loader = p.__loader__
-                self._package = self._package.replace('.', os.sep)
-                debug.logger & debug.flagSearcher and debug.logger(
-                    '%s is an importable egg at %s' % (self._package, os.path.split(p.__file__)[0]))
+        if self.__importError:
+            raise error.PySmiFileNotFoundError(self.__importError, searcher=self)
 
-            elif hasattr(p, '__file__'):
-                debug.logger & debug.flagSearcher and debug.logger(
-                    '%s is not an egg, trying it as a package directory' % self._package)
-                return PyFileSearcher(os.path.split(p.__file__)[0]).fileExists(mibname, mtime, rebuild=rebuild)
+        if self.__pyFileSearcher:
+            return self.__pyFileSearcher.fileExists(mibname, mtime, rebuild=rebuild)
 
-            else:
-                raise error.PySmiFileNotFoundError('%s is neither importable nor a file' % self._package, searcher=self)
+        stem = mibname.upper()
 
-        except ImportError:
-            raise error.PySmiFileNotFoundError('%s is not importable, trying as a path' % self._package, searcher=self)
+        members = self.__members
 
         for pySfx in BYTECODE_SUFFIXES:
-            f = os.path.join(self._package, mibname.upper()) + pySfx
+            info = members.get(stem + pySfx.upper())
 
-            if f not in self.__loader._files:
-                debug.logger & debug.flagSearcher and debug.logger('%s is not in %s' % (f, self._package))
+            if info is None:
+                debug.logger & debug.flagSearcher and debug.logger('%s is not in %s' % (mibname + pySfx, self._package))
                 continue
 
-            pyData = self.__loader.get_data(f)
-            if pyData[:4] == PY_MAGIC_NUMBER:
-                pyData = pyData[4:]
-                pyTime = struct.unpack('<L', pyData[:4])[0]
+            f = info.filename
+
+            # header is all that is needed, spare decompressing the rest
+            fp = self.__archive.open(info)
+
+            try:
+                pyData = fp.read(PY_TIME_OFFSET + PY_TIME_STRUCT.size)
+
+            finally:
+                fp.close()
+
+            if pyData[:4] == PY_MAGIC_NUMBER and len(pyData) == PY_TIME_OFFSET + PY_TIME_STRUCT.size:
+                # PEP 552 hash-based bytecode carries no source mtime
+                if PY_TIME_OFFSET > 4 and PY_TIME_STRUCT.unpack_from(pyData, 4)[0] & 1:
+                    debug.logger & debug.flagSearcher and debug.logger('%s is hash-based, skipping' % f)
+                    continue
+
+                pyTime = PY_TIME_STRUCT.unpack_from(pyData, PY_TIME_OFFSET)[0]
                 debug.logger & debug.flagSearcher and debug.logger(
                     'found %s, mtime %s' % (f, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(pyTime))))
                 if pyTime >= mtime:
@@ -117,17 +157,16 @@ class PyPackageSearcher(AbstractSearcher):
                 continue
 
         for pySfx in SOURCE_SUFFIXES:
+            info = members.get(stem + pySfx.upper())
 
-            f = os.path.join(self._package, mibname.upper()) + pySfx
-
-            if f not in self.__loader._files:
-                debug.logger & debug.flagSearcher and debug.logger('%s is not in %s' % (f, self._package))
+            if info is None:
+                debug.logger & debug.flagSearcher and debug.logger('%s is not in %s' % (mibname + pySfx, self._package))
                 continue
 
-            pyTime = self._parseDosTime(
-                self.__loader._files[f][6],
-                self.__loader._files[f][5]
-            )
+            f = info.filename
+
+            # ZIP stores local time
+            pyTime = time.mktime(info.date_time + (0, 0, -1))
 
             debug.logger & debug.flagSearcher and debug.logger(
                 'found %s, mtime %s' % (f, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(pyTime))))
@@ -21,15 +21,17 @@ class StubSearcher(AbstractSearcher):
                mibnames (str): blacklisted MIB names
         """
         self._mibnames = mibnames
+        self._mibset = frozenset(mibnames)
+        self._joinedNames = ', '.join(mibnames)
 
     def __str__(self):
         return '%s' % self.__class__.__name__
 
     def fileExists(self, mibname, mtime, rebuild=False):
-        if mibname in self._mibnames:
+        if mibname in self._mibset:
             debug.logger & debug.flagSearcher and debug.logger('pretend compiled %s exists and is very new' % mibname)
-            raise error.PySmiFileNotModifiedError('compiled file %s is among %s' % (mibname, ', '.join(self._mibnames)),
+            raise error.PySmiFileNotModifiedError('compiled file %s is among %s' % (mibname, self._joinedNames),
                                                   searcher=self)
 
-        raise error.PySmiFileNotFoundError('no compiled file %s found among %s' % (mibname, ', '.join(self._mibnames)),
+        raise error.PySmiFileNotFoundError('no compiled file %s found among %s' % (mibname, self._joinedNames),
                                            searcher=self)
@@ -4,6 +4,9 @@
 # Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
 # License: http://snmplabs.com/pysmi/license.html
 #
+import os
+import tempfile
+
 
 class AbstractWriter(object):
     def setOptions(self, **kwargs):
@@ -16,3 +19,55 @@ class AbstractWriter(object):
 
     def getData(self, filename):
         raise NotImplementedError()
+
+    @staticmethod
+    def _writeChunks(fd, chunks):
+        if hasattr(os, 'writev'):
+            # gather write spares joining chunks into yet another copy
+            os.writev(fd, chunks)
+
+        else:
+            os.write(fd, b''.join(chunks))
+
+    @classmethod
+    def _storeFile(cls, filename, chunks):
+        """Atomically replace *filename* with concatenated *chunks* of bytes."""
+        dirname = os.path.dirname(filename)
+
+        # on Linux, a new file can be written unnamed and linked in place
+        # at once, sparing temporary name allocation and rename
+        if getattr(os, 'O_TMPFILE', None) and not os.path.exists(filename):
+            try:
+                fd = os.open(dirname, os.O_TMPFILE | os.O_WRONLY, 0o600)
+
+            except OSError:
+                pass  # not supported by kernel or file system
+
+            else:
+                try:
+                    cls._writeChunks(fd, chunks)
+                    os.link('/proc/self/fd/%d' % fd, filename)
+                    return
+
+                except OSError:
+                    pass  # no /proc or lost creation race, fall back to rename
+
+                finally:
+                    os.close(fd)
+
+        fd, tfile = tempfile.mkstemp(dir=dirname)
+
+        try:
+            try:
+                cls._writeChunks(fd, chunks)
+
+            finally:
+                os.close(fd)
+
+            os.rename(tfile, filename)
+
+        except (OSError, IOError):
+            if os.access(tfile, os.F_OK):
+                os.unlink(tfile)
+
+            raise
@@ -4,7 +4,6 @@
 # Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
 # License: http://snmplabs.com/pysmi/license.html
 #
-import sys
 from pysmi.writer.base import AbstractWriter
 from pysmi import debug
 from pysmi import error
@@ -42,9 +41,9 @@ class CallbackWriter(AbstractWriter):
         try:
             self._cbFun(mibname, data, self._cbCtx)
 
-        except Exception:
+        except Exception as exc:
             raise error.PySmiWriterError(
-                'user callback %s failure writing %s: %s' % (self._cbFun, mibname, sys.exc_info()[1]), writer=self)
+                'user callback %s failure writing %s: %s' % (self._cbFun, mibname, exc), writer=self)
 
         debug.logger & debug.flagWriter and debug.logger('user callback for %s succeeded' % mibname)
 
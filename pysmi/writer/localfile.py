@@ -6,7 +6,6 @@
 #
 import os
 import sys
-import tempfile
 from pysmi.writer.base import AbstractWriter
 from pysmi.compat import encode, decode
 from pysmi import debug
@@ -28,12 +27,15 @@ class FileWriter(AbstractWriter):
                path: writable directory to store created files
         """
         self._path = decode(os.path.normpath(path))
+        # joining with empty name adds separator only where needed
+        self._prefix = os.path.join(self._path, '')
+        self._pathChecked = False
 
     def __str__(self):
         return '%s{"%s"}' % (self.__class__.__name__, self._path)
 
     def getData(self, mibname, dryRun=False):
-        filename = os.path.join(self._path, decode(mibname)) + self.suffix
+        filename = self._prefix + decode(mibname) + self.suffix
 
         f = None
 
@@ -53,36 +55,30 @@ class FileWriter(AbstractWriter):
             debug.logger & debug.flagWriter and debug.logger('dry run mode')
             return
 
-        if not os.path.exists(self._path):
+        # destination directory is looked after on first write only
+        if not self._pathChecked:
             try:
                 os.makedirs(self._path)
 
             except OSError:
-                raise error.PySmiWriterError(
-                    'failure creating destination directory %s: %s' % (self._path, sys.exc_info()[1]), writer=self)
+                if not os.path.isdir(self._path):
+                    raise error.PySmiWriterError(
+                        'failure creating destination directory %s: %s' % (self._path, sys.exc_info()[1]), writer=self)
 
-        if comments:
-            data = '#\n' + ''.join(['# %s\n' % x for x in comments]) + '#\n' + data
+            self._pathChecked = True
 
-        filename = os.path.join(self._path, decode(mibname)) + self.suffix
-
-        tfile = None
+        filename = self._prefix + decode(mibname) + self.suffix
 
         try:
-            fd, tfile = tempfile.mkstemp(dir=self._path)
-            os.write(fd, encode(data))
-            os.close(fd)
-            os.rename(tfile, filename)
+            chunks = [encode(data)]
 
-        except (OSError, IOError, UnicodeEncodeError):
-            exc = sys.exc_info()
-            if tfile:
-                try:
-                    os.unlink(tfile)
+            if comments:
+                chunks.insert(0, encode(''.join(['#\n'] + ['# %s\n' % x for x in comments] + ['#\n'])))
 
-                except OSError:
-                    pass
+            self._storeFile(filename, chunks)
 
-            raise error.PySmiWriterError('failure writing file %s: %s' % (filename, exc[1]), file=filename, writer=self)
+        except (OSError, IOError, UnicodeEncodeError):
+            raise error.PySmiWriterError(
+                'failure writing file %s: %s' % (filename, sys.exc_info()[1]), file=filename, writer=self)
 
         debug.logger & debug.flagWriter and debug.logger('%s stored in %s' % (mibname, filename))
@@ -6,17 +6,11 @@
 #
 import os
 import sys
-import tempfile
 import py_compile
 
 try:
-    import importlib
-
-    try:
-        SOURCE_SUFFIXES = importlib.machinery.SOURCE_SUFFIXES
-
-    except Exception:
-        raise ImportError()
+    # submodule is imported explicitly, importlib alone does not load it
+    from importlib.machinery import SOURCE_SUFFIXES
 
 except ImportError:
     import imp
@@ -46,6 +40,9 @@ class PyFileWriter(AbstractWriter):
                path: writable directory to store Python modules
         """
         self._path = decode(os.path.normpath(path))
+        # joining with empty name adds separator only where needed
+        self._prefix = os.path.join(self._path, '')
+        self._pathChecked = False
 
     def __str__(self):
         return '%s{"%s"}' % (self.__class__.__name__, self._path)
@@ -55,34 +52,31 @@ class PyFileWriter(AbstractWriter):
             debug.logger & debug.flagWriter and debug.logger('dry run mode')
             return
 
-        if not os.path.exists(self._path):
+        # destination directory is looked after on first write only
+        if not self._pathChecked:
             try:
                 os.makedirs(self._path)
 
             except OSError:
-                raise error.PySmiWriterError(
-                    'failure creating destination directory %s: %s' % (self._path, sys.exc_info()[1]), writer=self)
-
-        if comments:
-            data = '#\n' + ''.join(['# %s\n' % x for x in comments]) + '#\n' + data
+                if not os.path.isdir(self._path):
+                    raise error.PySmiWriterError(
+                        'failure creating destination directory %s: %s' % (self._path, sys.exc_info()[1]), writer=self)
 
-        pyfile = os.path.join(self._path, decode(mibname))
-        pyfile += SOURCE_SUFFIXES[0]
+            self._pathChecked = True
 
-        tfile = None
+        pyfile = self._prefix + decode(mibname) + SOURCE_SUFFIXES[0]
 
         try:
-            fd, tfile = tempfile.mkstemp(dir=self._path)
-            os.write(fd, encode(data))
-            os.close(fd)
-            os.rename(tfile, pyfile)
+            chunks = [encode(data)]
 
-        except (OSError, IOError, UnicodeEncodeError):
-            exc = sys.exc_info()
-            if tfile and os.access(tfile, os.F_OK):
-                os.unlink(tfile)
+            if comments:
+                chunks.insert(0, encode(''.join(['#\n'] + ['# %s\n' % x for x in comments] + ['#\n'])))
+
+            self._storeFile(pyfile, chunks)
 
-            raise error.PySmiWriterError('failure writing file %s: %s' % (pyfile, exc[1]), file=pyfile, writer=self)
+        except (OSError, IOError, UnicodeEncodeError):
+            raise error.PySmiWriterError(
+                'failure writing file %s: %s' % (pyfile, sys.exc_info()[1]), file=pyfile, writer=self)
 
         debug.logger & debug.flagWriter and debug.logger('created file %s' % pyfile)
 
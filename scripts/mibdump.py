@@ -38,6 +38,7 @@ dstFormat = None
 dstTemplate = None
 dstDirectory = None
 cacheDirectory = ''
+cacheMibsFlag = False
 nodepsFlag = False
 rebuildFlag = False
 dryrunFlag = False
@@ -62,6 +63,7 @@ Usage: %s [--help]
       [--destination-template=<PATH>]
       [--destination-directory=<DIRECTORY>]
       [--cache-directory=<DIRECTORY>]
+      [--cache-mibs]
       [--disable-fuzzy-source]
       [--no-dependencies]
       [--no-python-compile]
@@ -92,7 +94,7 @@ try:
         ['help', 'version', 'quiet', 'debug=',
          'mib-source=', 'mib-searcher=', 'mib-stub=', 'mib-borrower=',
          'destination-format=', 'destination-template=',
-         'destination-directory=', 'cache-directory=', 'no-dependencies',
+         'destination-directory=', 'cache-directory=', 'cache-mibs', 'no-dependencies',
          'no-python-compile', 'python-optimization-level=', 'ignore-errors',
          'build-index', 'rebuild', 'dry-run', 'no-mib-writes',
          'generate-mib-texts', 'disable-fuzzy-source', 'keep-texts-layout']
@@ -156,6 +158,9 @@ Software documentation and support at http://snmplabs.com/pysmi
     if opt[0] == '--cache-directory':
         cacheDirectory = opt[1]
 
+    if opt[0] == '--cache-mibs':
+        cacheMibsFlag = True
+
     if opt[0] == '--no-dependencies':
         nodepsFlag = True
 
@@ -306,7 +311,8 @@ MIBs excluded from code generation: %s
 MIBs to compile: %s
 Destination format: %s
 Custom destination template: %s
-Parser grammar cache directory: %s
+Parser grammar and MIB locations cache directory: %s
+Cache parsed MIBs and generated code: %s
 Also compile all relevant MIBs: %s
 Rebuild MIBs regardless of age: %s
 Dry run mode: %s
@@ -326,6 +332,7 @@ Try various file names while searching for MIB module: %s
        dstFormat,
        dstTemplate,
        cacheDirectory or 'not used',
+       cacheDirectory and cacheMibsFlag and 'yes' or 'no',
        nodepsFlag and 'no' or 'yes',
        rebuildFlag and 'yes' or 'no',
        dryrunFlag and 'yes' or 'no',
@@ -349,7 +356,8 @@ mibCompiler = MibCompiler(
 try:
     mibCompiler.addSources(
         *getReadersFromUrls(
-            *mibSources, **dict(fuzzyMatching=doFuzzyMatchingFlag)
+            *mibSources, **dict(fuzzyMatching=doFuzzyMatchingFlag,
+                                resolveCacheFile=cacheDirectory and os.path.join(cacheDirectory, 'sources.json'))
         )
     )
 
@@ -365,7 +373,9 @@ try:
                            genTexts=genMibTextsFlag,
                            textFilter=keepTextsLayout and (lambda symbol, text: text) or None,
                            writeMibs=writeMibsFlag,
-                           ignoreErrors=ignoreErrorsFlag)
+                           ignoreErrors=ignoreErrorsFlag,
+                           astCache=cacheDirectory and cacheMibsFlag and os.path.join(cacheDirectory, 'ast'),
+                           codeCache=cacheDirectory and cacheMibsFlag and os.path.join(cacheDirectory, 'code'))
     )
 
     if buildIndexFlag:
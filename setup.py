@@ -63,7 +63,7 @@ if sys.version_info[:2] < (2, 4):
 
 
 try:
-    from setuptools import setup, Command
+    from setuptools import setup
 
     params = {'zip_safe': True}
 
@@ -73,7 +73,7 @@ except ImportError:
             howto_install_setuptools()
             sys.exit(1)
 
-    from distutils.core import setup, Command
+    from distutils.core import setup
 
     params = {}
 
@@ -128,29 +128,4 @@ params.update({
                 os.path.join('scripts', 'mibcopy.py')]
 })
 
-# handle unittest discovery feature
-if sys.version_info[0:2] < (2, 7) or \
-                sys.version_info[0:2] in ((3, 0), (3, 1)):
-    try:
-        import unittest2 as unittest
-    except ImportError:
-        unittest = None
-else:
-    import unittest
-
-if unittest:
-    class PyTest(Command):
-        user_options = []
-
-        def initialize_options(self): pass
-
-        def finalize_options(self): pass
-
-        def run(self):
-            suite = unittest.defaultTestLoader.discover('tests')
-            unittest.TextTestRunner(verbosity=2).run(suite)
-
-
-    params['cmdclass'] = {'test': PyTest}
-
 setup(**params)
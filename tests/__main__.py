@@ -12,6 +12,13 @@ except ImportError:
 
 suite = unittest.TestLoader().loadTestsFromNames(
     ['test_zipreader',
+     'test_ftpreader',
+     'test_localfile',
+     'test_filewriter',
+     'test_pyfilesearcher',
+     'test_pypackagesearcher',
+     'test_compiler',
+     'test_smilexer',
      'test_agentcapabilities_smiv2_pysnmp',
      'test_imports_smiv2_pysnmp',
      'test_modulecompliance_smiv2_pysnmp',
@@ -0,0 +1,285 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysmi/license.html
+#
+import os
+import sys
+import shutil
+import tempfile
+import threading
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.reader.callback import CallbackReader
+from pysmi.searcher.stub import StubSearcher
+from pysmi.writer.callback import CallbackWriter
+from pysmi.parser.smi import parserFactory
+from pysmi.codegen.pysnmp import PySnmpCodeGen
+from pysmi.compiler import MibCompiler
+
+
+class MibCompilerTestCase(unittest.TestCase):
+    mibs = {
+        'TEST-MIB': """
+TEST-MIB DEFINITIONS ::= BEGIN
+IMPORTS
+    OBJECT-IDENTITY
+FROM SNMPv2-SMI
+    otherObject
+FROM OTHER-MIB;
+
+testObject OBJECT-IDENTITY
+    STATUS          current
+    DESCRIPTION     "Initial version"
+
+ ::= { otherObject 1 }
+
+END
+""",
+        'OTHER-MIB': """
+OTHER-MIB DEFINITIONS ::= BEGIN
+
+otherObject OBJECT IDENTIFIER ::= { 1 3 6 }
+
+END
+"""
+    }
+
+    def setUp(self):
+        self.stored = {}
+        self.queried = []
+        self.readers = set()
+
+        self.mibCompiler = MibCompiler(
+            parserFactory()(), PySnmpCodeGen(), CallbackWriter(self.storeMib)
+        )
+
+        self.mibCompiler.addSearchers(StubSearcher(*PySnmpCodeGen.baseMibs))
+
+    def storeMib(self, mibname, data, cbCtx):
+        self.stored[mibname] = data
+
+    def readMib(self, mibname, cbCtx):
+        self.queried.append((cbCtx, mibname))
+        self.readers.add(threading.current_thread())
+        return cbCtx.get(mibname)
+
+    def testCompileWithDependencies(self):
+        self.mibCompiler.addSources(CallbackReader(self.readMib, self.mibs))
+
+        processed = self.mibCompiler.compile('TEST-MIB', ignoreErrors=True)
+
+        self.assertEqual(processed['TEST-MIB'], 'compiled', 'bad status')
+        self.assertEqual(processed['OTHER-MIB'], 'compiled', 'bad status')
+        self.assertEqual(processed['SNMPv2-SMI'], 'missing', 'bad status')
+        self.assertEqual(sorted(self.stored), ['OTHER-MIB', 'TEST-MIB'], 'MIBs not stored')
+
+    def testCompileFailsOnMissingDependency(self):
+        self.mibCompiler.addSources(CallbackReader(self.readMib, self.mibs))
+
+        processed = self.mibCompiler.compile('TEST-MIB')
+
+        self.assertEqual(processed['TEST-MIB'], 'unprocessed', 'bad status')
+        self.assertFalse(self.stored, 'MIBs stored')
+
+    def testCompileFromSecondSource(self):
+        self.mibCompiler.addSources(
+            CallbackReader(self.readMib, {}),
+            CallbackReader(self.readMib, self.mibs)
+        )
+
+        processed = self.mibCompiler.compile('TEST-MIB', ignoreErrors=True)
+
+        self.assertEqual(processed['TEST-MIB'], 'compiled', 'bad status')
+        self.assertTrue('testObject' in self.stored['TEST-MIB'], 'bad MIB stored')
+
+    def testCompilePrefersEarlierSource(self):
+        mibs = {'OTHER-MIB': self.mibs['OTHER-MIB'].replace('otherObject', 'firstObject')}
+        mibs['TEST-MIB'] = self.mibs['TEST-MIB'].replace('otherObject', 'firstObject')
+
+        self.mibCompiler.addSources(
+            CallbackReader(self.readMib, mibs),
+            CallbackReader(self.readMib, self.mibs)
+        )
+
+        processed = self.mibCompiler.compile('TEST-MIB', ignoreErrors=True)
+
+        self.assertEqual(processed['TEST-MIB'], 'compiled', 'bad status')
+        self.assertTrue('firstObject' in self.stored['TEST-MIB'], 'MIB taken from wrong source')
+        self.assertFalse([x for x in self.queried if x[0] is self.mibs and x[1] in mibs], 'later source queried')
+
+    def testCompileReadsInCallingThread(self):
+        self.mibCompiler.addSources(CallbackReader(self.readMib, self.mibs))
+
+        processed = self.mibCompiler.compile('TEST-MIB', ignoreErrors=True)
+
+        self.assertEqual(processed['TEST-MIB'], 'compiled', 'bad status')
+        self.assertEqual(self.readers, set([threading.current_thread()]), 'MIBs read in other thread')
+
+    def testCompileWithPrefetch(self):
+        self.mibCompiler.addSources(CallbackReader(self.readMib, self.mibs))
+
+        processed = self.mibCompiler.compile('TEST-MIB', ignoreErrors=True, prefetchDepth=2)
+
+        self.assertEqual(processed['TEST-MIB'], 'compiled', 'bad status')
+        self.assertEqual(processed['OTHER-MIB'], 'compiled', 'bad status')
+        self.assertEqual(len([x for x in self.queried if x[1] == 'OTHER-MIB']), 1, 'MIB read more than once')
+
+    def testCompileInParallel(self):
+        self.mibCompiler.addSources(CallbackReader(self.readMib, self.mibs))
+
+        self.mibCompiler.compile('TEST-MIB', ignoreErrors=True)
+
+        serial = self.stored
+        self.stored = {}
+
+        processed = self.mibCompiler.compile('TEST-MIB', ignoreErrors=True, rebuild=True, jobs=2)
+
+        self.assertEqual(processed['TEST-MIB'], 'compiled', 'bad status')
+        self.assertEqual(processed['OTHER-MIB'], 'compiled', 'bad status')
+        self.assertEqual(sorted(self.stored), sorted(serial), 'MIBs not stored')
+
+        for mibname in serial:
+            self.assertEqual([x for x in self.stored[mibname].split('\n') if 'Produced by' not in x],
+                             [x for x in serial[mibname].split('\n') if 'Produced by' not in x], 'code differs')
+
+    def testCompileWithAstCache(self):
+        cacheDir = tempfile.mkdtemp()
+
+        try:
+            self.mibCompiler.addSources(CallbackReader(self.readMib, self.mibs))
+
+            self.mibCompiler.compile('TEST-MIB', ignoreErrors=True, astCache=cacheDir)
+
+            self.assertEqual(len(os.listdir(cacheDir)), 2, 'parsed MIBs not cached')
+
+            parsed = self.stored
+            self.stored = {}
+
+            def parse(data, **kwargs):
+                raise AssertionError('cached MIB parsed again')
+
+            self.mibCompiler._parser.parse = parse
+
+            processed = self.mibCompiler.compile('TEST-MIB', ignoreErrors=True, rebuild=True, astCache=cacheDir)
+
+            self.assertEqual(processed['TEST-MIB'], 'compiled', 'bad status')
+            self.assertEqual(processed['OTHER-MIB'], 'compiled', 'bad status')
+            self.assertEqual(sorted(self.stored), sorted(parsed), 'MIBs not stored')
+
+        finally:
+            shutil.rmtree(cacheDir)
+
+    def testCompileIgnoresSharedAstCache(self):
+        if not hasattr(os, 'getuid'):
+            return
+
+        cacheDir = tempfile.mkdtemp()
+
+        try:
+            self.mibCompiler.addSources(CallbackReader(self.readMib, self.mibs))
+
+            self.mibCompiler.compile('TEST-MIB', ignoreErrors=True, astCache=cacheDir)
+
+            os.chmod(cacheDir, 0o777)
+
+            parsed = []
+            parse = self.mibCompiler._parser.parse
+
+            def parseAgain(data, **kwargs):
+                parsed.append(data)
+                return parse(data, **kwargs)
+
+            self.mibCompiler._parser.parse = parseAgain
+
+            processed = self.mibCompiler.compile('TEST-MIB', ignoreErrors=True, rebuild=True, astCache=cacheDir)
+
+            self.assertEqual(processed['TEST-MIB'], 'compiled', 'bad status')
+            self.assertEqual(len(parsed), 2, 'untrusted cache used')
+
+        finally:
+            shutil.rmtree(cacheDir)
+
+    def testCompileWithCodeCache(self):
+        cacheDir = tempfile.mkdtemp()
+
+        try:
+            self.mibCompiler.addSources(CallbackReader(self.readMib, self.mibs))
+
+            self.mibCompiler.compile('TEST-MIB', ignoreErrors=True, codeCache=cacheDir)
+
+            self.assertEqual(len(os.listdir(cacheDir)), 2, 'generated code not cached')
+
+            generated = self.stored
+            self.stored = {}
+
+            def genCode(ast, symbolTable, **kwargs):
+                raise AssertionError('cached MIB generated again')
+
+            self.mibCompiler._codegen.genCode = genCode
+
+            processed = self.mibCompiler.compile('TEST-MIB', ignoreErrors=True, rebuild=True, codeCache=cacheDir)
+
+            self.assertEqual(processed['TEST-MIB'], 'compiled', 'bad status')
+            self.assertEqual(processed['OTHER-MIB'], 'compiled', 'bad status')
+            self.assertEqual(self.stored, generated, 'cached code differs')
+
+        finally:
+            shutil.rmtree(cacheDir)
+
+    def testCompileWithCodeCacheOnOtherHost(self):
+        cacheDir = tempfile.mkdtemp()
+
+        try:
+            self.mibCompiler.addSources(CallbackReader(self.readMib, self.mibs))
+
+            self.mibCompiler.compile('TEST-MIB', ignoreErrors=True, codeCache=cacheDir)
+
+            platformInfo, userInfo = self.mibCompiler._get_system_info()
+            platformInfo = list(platformInfo)
+            platformInfo[2] = 'other-release'
+
+            self.mibCompiler._get_system_info = lambda: (platformInfo, userInfo)
+
+            self.mibCompiler.compile('TEST-MIB', ignoreErrors=True, rebuild=True, codeCache=cacheDir)
+
+            self.assertEqual(len(os.listdir(cacheDir)), 4, 'code with stale header reused')
+            self.assertTrue('other-release' in self.stored['TEST-MIB'], 'stale header stored')
+
+        finally:
+            shutil.rmtree(cacheDir)
+
+    def testCompileAsync(self):
+        try:
+            import asyncio
+
+        except ImportError:
+            return
+
+        self.mibCompiler.addSources(CallbackReader(self.readMib, self.mibs))
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        try:
+            processed = loop.run_until_complete(
+                self.mibCompiler.compileAsync('TEST-MIB', ignoreErrors=True))
+
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+        self.assertEqual(processed['TEST-MIB'], 'compiled', 'bad status')
+        self.assertEqual(sorted(self.stored), ['OTHER-MIB', 'TEST-MIB'], 'MIBs not stored')
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,59 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysmi/license.html
+#
+import os
+import sys
+import shutil
+import tempfile
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.writer.localfile import FileWriter
+from pysmi import error
+
+
+class FileWriterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.writer = FileWriter(os.path.join(self.path, 'mibs')).setOptions(suffix='.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def testPutData(self):
+        self.writer.putData('TEST-MIB', '{}\n')
+
+        self.assertEqual(self.writer.getData('TEST-MIB'), '{}\n', 'bad data stored')
+        self.assertEqual(os.listdir(os.path.join(self.path, 'mibs')), ['TEST-MIB.json'], 'stray files left')
+
+    def testPutDataReplaces(self):
+        self.writer.putData('TEST-MIB', '{}\n')
+        self.writer.putData('TEST-MIB', '[]\n')
+
+        self.assertEqual(self.writer.getData('TEST-MIB'), '[]\n', 'file not replaced')
+        self.assertEqual(os.listdir(os.path.join(self.path, 'mibs')), ['TEST-MIB.json'], 'stray files left')
+
+    def testPutDataComments(self):
+        self.writer.putData('TEST-MIB', '{}\n', comments=['first', 'second'])
+
+        self.assertEqual(self.writer.getData('TEST-MIB'), '#\n# first\n# second\n#\n{}\n', 'bad data stored')
+
+    def testPutDataFails(self):
+        os.makedirs(os.path.join(self.path, 'mibs', 'TEST-MIB.json'))
+
+        self.assertRaises(error.PySmiWriterError, self.writer.putData, 'TEST-MIB', '{}\n')
+        self.assertEqual(os.listdir(os.path.join(self.path, 'mibs')), ['TEST-MIB.json'], 'stray files left')
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,133 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysmi/license.html
+#
+import sys
+import calendar
+import ftplib
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.reader.ftpclient import FtpReader
+from pysmi import error
+
+
+class FakeFtp(object):
+    files = {}
+    mdtm = '213 20200301120000'
+    connections = 0
+    alive = True
+
+    def connect(self, host, port, timeout):
+        FakeFtp.connections += 1
+        FakeFtp.alive = True
+
+    def login(self, user, password):
+        pass
+
+    def voidcmd(self, cmd):
+        if not self.alive:
+            raise EOFError()
+
+        return '200 NOOP ok'
+
+    def sendcmd(self, cmd):
+        if self.mdtm is None:
+            raise ftplib.error_perm('502 MDTM not implemented')
+
+        return self.mdtm
+
+    def retrbinary(self, cmd, callback, blocksize=8192):
+        location = cmd.split(' ', 1)[1]
+
+        if location not in self.files:
+            raise ftplib.error_perm('550 %s: no such file' % location)
+
+        data = self.files[location].encode('utf-8')
+
+        for offset in range(0, len(data), blocksize):
+            callback(data[offset:offset + blocksize])
+
+    def close(self):
+        pass
+
+
+class FtpReaderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.FTP = ftplib.FTP
+        ftplib.FTP = FakeFtp
+
+        FakeFtp.files = {'/mibs/TEST-MIB': 'TEST-MIB DEFINITIONS ::= BEGIN\nEND'}
+        FakeFtp.mdtm = '213 20200301120000'
+        FakeFtp.connections = 0
+
+        self.reader = FtpReader('localhost', '/mibs/@mib@')
+
+    def tearDown(self):
+        self.reader.close()
+        ftplib.FTP = self.FTP
+
+    def testGetData(self):
+        mibInfo, data = self.reader.getData('TEST-MIB')
+
+        self.assertEqual(data, 'TEST-MIB DEFINITIONS ::= BEGIN\nEND', 'bad MIB data')
+        self.assertEqual(mibInfo.path, 'ftp://localhost/mibs/TEST-MIB', 'bad MIB path')
+
+    def testGetDataInBlocks(self):
+        text = 'TEST-MIB DEFINITIONS ::= BEGIN\r\n' + '-- comment\r\n' * 2000 + 'END\r\n'
+        FakeFtp.files['/mibs/TEST-MIB'] = text
+
+        mibInfo, data = self.reader.getData('TEST-MIB')
+
+        self.assertEqual(data, text, 'bad MIB data')
+
+    def testGetDataMtime(self):
+        mibInfo, data = self.reader.getData('TEST-MIB')
+
+        self.assertEqual(mibInfo.mtime, calendar.timegm((2020, 3, 1, 12, 0, 0, 0, 0, 0)), 'bad MIB mtime')
+
+    def testGetDataFractionalMtime(self):
+        FakeFtp.mdtm = '213 20200301120000.123'
+
+        mibInfo, data = self.reader.getData('TEST-MIB')
+
+        self.assertEqual(mibInfo.mtime, calendar.timegm((2020, 3, 1, 12, 0, 0, 0, 0, 0)), 'bad MIB mtime')
+
+    def testGetDataMalformedMtime(self):
+        FakeFtp.mdtm = '213 yesterday'
+
+        mibInfo, data = self.reader.getData('TEST-MIB')
+
+        self.assertTrue(mibInfo.mtime > calendar.timegm((2020, 3, 1, 12, 0, 0, 0, 0, 0)), 'bad MIB mtime')
+
+    def testGetDataReusesConnection(self):
+        self.reader.getData('TEST-MIB')
+        self.reader.getData('TEST-MIB')
+
+        self.assertEqual(FakeFtp.connections, 1, 'connection not reused')
+
+    def testGetDataReconnects(self):
+        self.reader.getData('TEST-MIB')
+
+        FakeFtp.alive = False
+
+        mibInfo, data = self.reader.getData('TEST-MIB')
+
+        self.assertEqual(data, 'TEST-MIB DEFINITIONS ::= BEGIN\nEND', 'bad MIB data')
+        self.assertEqual(FakeFtp.connections, 2, 'dropped connection not replaced')
+
+    def testGetDataNotFound(self):
+        self.assertRaises(error.PySmiReaderFileNotFoundError, self.reader.getData, 'OTHER-MIB')
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -30,15 +30,16 @@ IMPORTS
 END
  """
 
-    def setUp(self):
-        ast = parserFactory()().parse(self.__class__.__doc__)[0]
+    @classmethod
+    def setUpClass(cls):
+        ast = parserFactory()().parse(cls.__doc__)[0]
         mibInfo, symtable = SymtableCodeGen().genCode(ast, {}, genTexts=True)
-        self.mibInfo, pycode = PySnmpCodeGen().genCode(ast, {mibInfo.name: symtable}, genTexts=True)
+        cls.mibInfo, pycode = PySnmpCodeGen().genCode(ast, {mibInfo.name: symtable}, genTexts=True)
         codeobj = compile(pycode, 'test', 'exec')
 
-        self.ctx = {'mibBuilder': MibBuilder()}
+        cls.ctx = {'mibBuilder': MibBuilder()}
 
-        exec(codeobj, self.ctx, self.ctx)
+        exec(codeobj, cls.ctx, cls.ctx)
 
     def testModuleImportsRequiredMibs(self):
         self.assertEqual(
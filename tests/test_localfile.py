@@ -0,0 +1,228 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysmi/license.html
+#
+import os
+import sys
+import shutil
+import tempfile
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.reader.localfile import FileReader
+from pysmi import error
+
+
+class FileReaderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.cacheDir = tempfile.mkdtemp()
+
+        os.makedirs(os.path.join(self.path, 'subdir', 'subsubdir'))
+
+        self.writeFile('TEST-MIB.txt', 'TEST-MIB DEFINITIONS ::= BEGIN\nEND\n')
+        self.writeFile(os.path.join('subdir', 'subsubdir', 'OTHER-MIB'), 'OTHER-MIB DEFINITIONS ::= BEGIN\nEND\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+        shutil.rmtree(self.cacheDir)
+
+    def writeFile(self, filename, data):
+        f = open(os.path.join(self.path, filename), 'w')
+        f.write(data)
+        f.close()
+
+    def testGetData(self):
+        mibInfo, data = FileReader(self.path).getData('TEST-MIB')
+
+        self.assertEqual(data, 'TEST-MIB DEFINITIONS ::= BEGIN\nEND\n', 'bad MIB data')
+        self.assertEqual(mibInfo.file, 'TEST-MIB.txt', 'bad MIB file')
+        self.assertEqual(mibInfo.mtime, os.stat(os.path.join(self.path, 'TEST-MIB.txt'))[8], 'bad MIB mtime')
+
+    def testGetDataFromSubdir(self):
+        mibInfo, data = FileReader(self.path).getData('OTHER-MIB')
+
+        self.assertEqual(data, 'OTHER-MIB DEFINITIONS ::= BEGIN\nEND\n', 'bad MIB data')
+        self.assertEqual(mibInfo.path, 'file://%s' % os.path.join(self.path, 'subdir', 'subsubdir', 'OTHER-MIB'),
+                         'bad MIB path')
+
+    def testGetDataNotRecursive(self):
+        self.assertRaises(error.PySmiReaderFileNotFoundError,
+                          FileReader(self.path, recursive=False).getData, 'OTHER-MIB')
+
+    def testGetDataTooLarge(self):
+        reader = FileReader(self.path, ignoreErrors=False)
+        reader.maxMibSize = 10
+
+        self.assertRaises(error.PySmiError, reader.getData, 'TEST-MIB')
+
+    def testGetDataNotFound(self):
+        self.assertRaises(error.PySmiReaderFileNotFoundError, FileReader(self.path).getData, 'NO-SUCH-MIB')
+
+    def testGetDataSeesNewFiles(self):
+        reader = FileReader(self.path)
+
+        self.assertRaises(error.PySmiReaderFileNotFoundError, reader.getData, 'NEW-MIB')
+
+        self.writeFile('NEW-MIB.my', 'NEW-MIB DEFINITIONS ::= BEGIN\nEND\n')
+
+        # make sure directory change is visible on coarse mtime filesystems
+        mtime = os.stat(self.path).st_mtime + 10
+        os.utime(self.path, (mtime, mtime))
+
+        mibInfo, data = reader.getData('NEW-MIB')
+
+        self.assertEqual(mibInfo.file, 'NEW-MIB.my', 'bad MIB file')
+
+    def testGetDataFromNewSubdir(self):
+        reader = FileReader(self.path)
+
+        reader.getData('TEST-MIB')
+
+        os.makedirs(os.path.join(self.path, 'newdir'))
+        self.writeFile(os.path.join('newdir', 'NEW-MIB'), 'NEW-MIB DEFINITIONS ::= BEGIN\nEND\n')
+
+        reader.invalidate()
+
+        mibInfo, data = reader.getData('NEW-MIB')
+
+        self.assertEqual(mibInfo.path, 'file://%s' % os.path.join(self.path, 'newdir', 'NEW-MIB'), 'bad MIB path')
+
+    def testGetDataFromIndex(self):
+        self.writeFile('.index', 'OTHER-MIB %s comment\n\n' % os.path.join('subdir', 'subsubdir', 'OTHER-MIB'))
+
+        mibInfo, data = FileReader(self.path, recursive=False).getData('OTHER-MIB')
+
+        self.assertEqual(data, 'OTHER-MIB DEFINITIONS ::= BEGIN\nEND\n', 'bad MIB data')
+
+    def testLoadIndexShared(self):
+        indexFile = os.path.join(self.path, '.index')
+
+        self.writeFile('.index', 'OTHER-MIB OTHER-MIB\n')
+
+        mibIndex = FileReader.loadIndex(indexFile)
+
+        self.assertTrue(FileReader.loadIndex(indexFile) is mibIndex, 'index file parsed again')
+
+        self.writeFile('.index', 'OTHER-MIB OTHER-MIB\nTEST-MIB TEST-MIB.txt\n')
+
+        self.assertEqual(FileReader.loadIndex(indexFile), {'OTHER-MIB': 'OTHER-MIB', 'TEST-MIB': 'TEST-MIB.txt'},
+                         'changed index file not reloaded')
+
+    def testGetDataFromResolveCache(self):
+        cacheFile = os.path.join(self.cacheDir, 'sources.json')
+
+        reader = FileReader(self.path).setOptions(resolveCacheFile=cacheFile)
+        reader.getData('OTHER-MIB')
+
+        self.assertFalse(os.path.exists(cacheFile), 'MIB locations stored before close')
+
+        reader.close()
+
+        self.assertTrue(os.path.exists(cacheFile), 'MIB location not cached')
+
+        reader = FileReader(self.path).setOptions(resolveCacheFile=cacheFile)
+
+        def getSubdirs(*args):
+            raise AssertionError('directory tree walked')
+
+        reader.getSubdirs = getSubdirs
+
+        mibInfo, data = reader.getData('OTHER-MIB')
+
+        self.assertEqual(data, 'OTHER-MIB DEFINITIONS ::= BEGIN\nEND\n', 'bad MIB data')
+        self.assertEqual(mibInfo.file, 'OTHER-MIB', 'bad MIB file')
+
+    def testGetDataResolveCacheOutdated(self):
+        cacheFile = os.path.join(self.cacheDir, 'sources.json')
+
+        reader = FileReader(self.path).setOptions(resolveCacheFile=cacheFile)
+        reader.getData('OTHER-MIB')
+        reader.close()
+
+        os.remove(os.path.join(self.path, 'subdir', 'subsubdir', 'OTHER-MIB'))
+        self.writeFile(os.path.join('subdir', 'OTHER-MIB.my'), 'OTHER-MIB DEFINITIONS ::= BEGIN\nEND -- moved\n')
+
+        mibInfo, data = FileReader(self.path).setOptions(resolveCacheFile=cacheFile).getData('OTHER-MIB')
+
+        self.assertEqual(data, 'OTHER-MIB DEFINITIONS ::= BEGIN\nEND -- moved\n', 'stale MIB location used')
+
+    def testGetDataResolveCacheShadowed(self):
+        cacheFile = os.path.join(self.cacheDir, 'sources.json')
+
+        reader = FileReader(self.path).setOptions(resolveCacheFile=cacheFile)
+        reader.getData('OTHER-MIB')
+        reader.close()
+
+        self.writeFile(os.path.join('subdir', 'OTHER-MIB.txt'), 'OTHER-MIB DEFINITIONS ::= BEGIN\nEND -- new\n')
+
+        # make sure directory change is visible on coarse mtime filesystems
+        path = os.path.join(self.path, 'subdir')
+        mtime = os.stat(path).st_mtime + 10
+        os.utime(path, (mtime, mtime))
+
+        mibInfo, data = FileReader(self.path).setOptions(resolveCacheFile=cacheFile).getData('OTHER-MIB')
+
+        self.assertEqual(data, 'OTHER-MIB DEFINITIONS ::= BEGIN\nEND -- new\n', 'shadowed MIB location used')
+
+    def testGetDataResolveCacheNotRecursive(self):
+        cacheFile = os.path.join(self.cacheDir, 'sources.json')
+
+        reader = FileReader(self.path).setOptions(resolveCacheFile=cacheFile)
+        reader.getData('OTHER-MIB')
+        reader.close()
+
+        reader = FileReader(self.path, recursive=False).setOptions(resolveCacheFile=cacheFile)
+
+        self.assertRaises(error.PySmiReaderFileNotFoundError, reader.getData, 'OTHER-MIB')
+
+    def testResolveCacheMerged(self):
+        cacheFile = os.path.join(self.cacheDir, 'sources.json')
+
+        readers = [FileReader(self.path).setOptions(resolveCacheFile=cacheFile) for x in range(2)]
+
+        readers[0].getData('TEST-MIB')
+        readers[1].getData('OTHER-MIB')
+
+        for reader in readers:
+            reader.close()
+
+        reader = FileReader(self.path).setOptions(resolveCacheFile=cacheFile)
+
+        def getSubdirs(*args):
+            raise AssertionError('directory tree walked')
+
+        reader.getSubdirs = getSubdirs
+
+        reader.getData('TEST-MIB')
+        reader.getData('OTHER-MIB')
+
+    def testGetDataWalksTreeOnce(self):
+        reader = FileReader(self.path)
+
+        walks = []
+
+        def getSubdirs(path, *args):
+            if path == reader._path:
+                walks.append(path)
+            return FileReader.getSubdirs(reader, path, *args)
+
+        reader.getSubdirs = getSubdirs
+
+        reader.getData('TEST-MIB')
+        reader.getData('OTHER-MIB')
+
+        self.assertEqual(len(walks), 1, 'directory tree walked more than once')
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
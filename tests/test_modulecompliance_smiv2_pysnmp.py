@@ -40,18 +40,19 @@ testCompliance MODULE-COMPLIANCE
 END
  """
 
-    def setUp(self):
-        ast = parserFactory()().parse(self.__class__.__doc__)[0]
+    @classmethod
+    def setUpClass(cls):
+        ast = parserFactory()().parse(cls.__doc__)[0]
         mibInfo, symtable = SymtableCodeGen().genCode(ast, {}, genTexts=True)
-        self.mibInfo, pycode = PySnmpCodeGen().genCode(ast, {mibInfo.name: symtable}, genTexts=True)
+        cls.mibInfo, pycode = PySnmpCodeGen().genCode(ast, {mibInfo.name: symtable}, genTexts=True)
         codeobj = compile(pycode, 'test', 'exec')
 
         mibBuilder = MibBuilder()
         mibBuilder.loadTexts = True
 
-        self.ctx = {'mibBuilder': mibBuilder}
+        cls.ctx = {'mibBuilder': mibBuilder}
 
-        exec(codeobj, self.ctx, self.ctx)
+        exec(codeobj, cls.ctx, cls.ctx)
 
     def testModuleComplianceSymbol(self):
         self.assertTrue(
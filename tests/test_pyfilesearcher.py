@@ -0,0 +1,73 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysmi/license.html
+#
+import os
+import sys
+import shutil
+import tempfile
+import py_compile
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.searcher.pyfile import PyFileSearcher, BYTECODE_SUFFIXES
+from pysmi import error
+
+
+class PyFileSearcherTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.source = os.path.join(tempfile.mkdtemp(), 'TEST-MIB.py')
+
+        f = open(self.source, 'w')
+        f.write('x = 1\n')
+        f.close()
+
+        self.mtime = int(os.stat(self.source).st_mtime)
+
+        py_compile.compile(self.source, cfile=os.path.join(self.path, 'TEST-MIB' + BYTECODE_SUFFIXES[0]),
+                           doraise=True)
+
+        self.searcher = PyFileSearcher(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+        shutil.rmtree(os.path.dirname(self.source))
+
+    def testBytecodeUpToDate(self):
+        self.assertRaises(error.PySmiFileNotModifiedError, self.searcher.fileExists, 'TEST-MIB', self.mtime)
+
+    def testBytecodeOutdated(self):
+        self.assertRaises(error.PySmiFileNotFoundError, self.searcher.fileExists, 'TEST-MIB', self.mtime + 1)
+
+    def testBytecodeMissing(self):
+        self.assertRaises(error.PySmiFileNotFoundError, self.searcher.fileExists, 'OTHER-MIB', self.mtime)
+
+    def testBytecodeHashBased(self):
+        if not hasattr(py_compile, 'PycInvalidationMode'):
+            return
+
+        py_compile.compile(self.source, cfile=os.path.join(self.path, 'TEST-MIB' + BYTECODE_SUFFIXES[0]),
+                           doraise=True, invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH)
+
+        self.assertRaises(error.PySmiFileNotFoundError, self.searcher.fileExists, 'TEST-MIB', 0)
+
+        shutil.copy(self.source, self.path)
+
+        self.assertRaises(error.PySmiFileNotModifiedError, self.searcher.fileExists, 'TEST-MIB', 0)
+
+    def testRebuild(self):
+        self.assertEqual(self.searcher.fileExists('TEST-MIB', self.mtime, rebuild=True), None)
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
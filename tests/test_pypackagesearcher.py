@@ -0,0 +1,105 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysmi/license.html
+#
+import os
+import sys
+import time
+import shutil
+import zipfile
+import tempfile
+import py_compile
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.searcher.pypackage import PyPackageSearcher, BYTECODE_SUFFIXES
+from pysmi import error
+
+
+class PyPackageSearcherTestCase(unittest.TestCase):
+    package = 'pysmi_test_mibs'
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+        egg = zipfile.ZipFile(os.path.join(self.path, 'mibs.egg'), 'w')
+
+        for filename in ('__init__.py', 'TEST-MIB.py', 'SNMPv2-TEST-MIB.py'):
+            egg.writestr(zipfile.ZipInfo(self.package + '/' + filename, (2020, 3, 1, 12, 0, 0)), '')
+
+        egg.close()
+
+        self.mtime = time.mktime((2020, 3, 1, 12, 0, 0, -1, -1, -1))
+
+        sys.path.insert(0, os.path.join(self.path, 'mibs.egg'))
+
+        self.searcher = PyPackageSearcher(self.package)
+
+    def tearDown(self):
+        self.searcher.close()
+        sys.path.remove(os.path.join(self.path, 'mibs.egg'))
+        sys.modules.pop(self.package, None)
+        sys.path_importer_cache.pop(os.path.join(self.path, 'mibs.egg'), None)
+        shutil.rmtree(self.path)
+
+    def testEggUpToDate(self):
+        self.assertRaises(error.PySmiFileNotModifiedError, self.searcher.fileExists, 'TEST-MIB', self.mtime)
+
+    def testEggOutdated(self):
+        self.assertRaises(error.PySmiFileNotFoundError, self.searcher.fileExists, 'TEST-MIB', self.mtime + 1)
+
+    def testEggMixedCase(self):
+        self.assertRaises(error.PySmiFileNotModifiedError, self.searcher.fileExists, 'SNMPv2-TEST-MIB', self.mtime)
+        self.assertRaises(error.PySmiFileNotModifiedError, self.searcher.fileExists, 'test-mib', self.mtime)
+
+    def testEggRepeatedly(self):
+        self.assertRaises(error.PySmiFileNotFoundError, self.searcher.fileExists, 'OTHER-MIB', self.mtime)
+        self.assertRaises(error.PySmiFileNotModifiedError, self.searcher.fileExists, 'TEST-MIB', self.mtime)
+
+    def testImportedOnce(self):
+        self.assertRaises(error.PySmiFileNotModifiedError, self.searcher.fileExists, 'TEST-MIB', self.mtime)
+
+        sys.modules.pop(self.package)
+        sys.path.remove(os.path.join(self.path, 'mibs.egg'))
+
+        try:
+            self.assertRaises(error.PySmiFileNotModifiedError, self.searcher.fileExists, 'TEST-MIB', self.mtime)
+
+        finally:
+            sys.path.insert(0, os.path.join(self.path, 'mibs.egg'))
+
+    def testEggBytecode(self):
+        source = os.path.join(self.path, 'OTHER-MIB.py')
+
+        f = open(source, 'w')
+        f.write('x = 1\n')
+        f.close()
+
+        py_compile.compile(source, cfile=source + 'c', doraise=True)
+
+        egg = zipfile.ZipFile(os.path.join(self.path, 'mibs.egg'), 'a')
+        egg.write(source + 'c', self.package + '/OTHER-MIB' + BYTECODE_SUFFIXES[0])
+        egg.close()
+
+        mtime = int(os.stat(source).st_mtime)
+
+        self.assertRaises(error.PySmiFileNotModifiedError, self.searcher.fileExists, 'OTHER-MIB', mtime)
+        self.assertRaises(error.PySmiFileNotFoundError, self.searcher.fileExists, 'OTHER-MIB', mtime + 1)
+
+    def testNotImportable(self):
+        searcher = PyPackageSearcher('pysmi_no_such_package')
+
+        self.assertRaises(error.PySmiFileNotFoundError, searcher.fileExists, 'TEST-MIB', self.mtime)
+        self.assertRaises(error.PySmiFileNotFoundError, searcher.fileExists, 'TEST-MIB', self.mtime)
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
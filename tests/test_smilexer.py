@@ -0,0 +1,76 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysmi/license.html
+#
+import sys
+import logging
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.lexer.smi import SmiV2Lexer
+from pysmi import debug
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class SmiV2LexerTestCase(unittest.TestCase):
+
+    def testLexerLogsAfterDebugEnabled(self):
+        SmiV2Lexer()
+
+        handler = RecordingHandler()
+
+        debug.setLogger(
+            debug.Debug('lexer', printer=debug.Printer(
+                logger=logging.getLogger('pysmi.test.lexer'), handler=handler))
+        )
+
+        try:
+            del handler.messages[:]
+
+            SmiV2Lexer()
+
+        finally:
+            debug.setLogger(0)
+
+        self.assertTrue([x for x in handler.messages if 'exclusive state' in x], 'lexer build not logged')
+
+    def testLineNumberAfterMacro(self):
+        lexer = SmiV2Lexer().lexer
+
+        lexer.input("""\
+TEST-MIB DEFINITIONS ::= BEGIN
+
+OBJECT-TYPE MACRO ::=
+BEGIN
+    TYPE NOTATION ::= "SYNTAX" Syntax
+    VALUE NOTATION ::= value(VALUE ObjectName)
+END
+
+testObject OBJECT IDENTIFIER ::= { 1 3 6 }
+
+END
+""")
+
+        tokens = [(x.value, x.lineno) for x in iter(lexer.token, None)]
+
+        self.assertTrue(('testObject', 9) in tokens, 'bad line number')
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -47,18 +47,19 @@ TestTypeOpaque ::= Opaque
 END
  """
 
-    def setUp(self):
-        ast = parserFactory(**smiV1Relaxed)().parse(self.__class__.__doc__)[0]
-        mibInfo, symtable = SymtableCodeGen().genCode(ast, {}, genTexts=True)
-        self.mibInfo, pycode = PySnmpCodeGen().genCode(ast, {mibInfo.name: symtable}, genTexts=True)
+    @classmethod
+    def setUpClass(cls):
+        ast = parserFactory(**smiV1Relaxed)().parse(cls.__doc__)[0]
+        mibInfo, symtable = SymtableCodeGen().genCode(ast, {}, genTexts=False)
+        cls.mibInfo, pycode = PySnmpCodeGen().genCode(ast, {mibInfo.name: symtable}, genTexts=False)
         codeobj = compile(pycode, 'test', 'exec')
 
         mibBuilder = MibBuilder()
-        mibBuilder.loadTexts = True
+        mibBuilder.loadTexts = False
 
-        self.ctx = {'mibBuilder': mibBuilder}
+        cls.ctx = {'mibBuilder': mibBuilder}
 
-        exec(codeobj, self.ctx, self.ctx)
+        exec(codeobj, cls.ctx, cls.ctx)
 
     def protoTestSymbol(self, symbol, klass):
         self.assertTrue(
@@ -95,9 +96,9 @@ def decor(func, symbol, klass):
 
 
 for s, k in typesMap:
-    setattr(TypeDeclarationTestCase, 'testTypeDeclaration' + k + 'SymbolTestCase',
+    setattr(TypeDeclarationTestCase, 'testTypeDeclaration' + s + 'SymbolTestCase',
             decor(TypeDeclarationTestCase.protoTestSymbol, s, k))
-    setattr(TypeDeclarationTestCase, 'testTypeDeclaration' + k + 'ClassTestCase',
+    setattr(TypeDeclarationTestCase, 'testTypeDeclaration' + s + 'ClassTestCase',
             decor(TypeDeclarationTestCase.protoTestClass, s, k))
 
 # XXX constraints flavor not checked
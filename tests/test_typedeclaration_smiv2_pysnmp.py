@@ -85,18 +85,19 @@ TestTextualConvention ::= TEXTUAL-CONVENTION
 END
  """
 
-    def setUp(self):
-        ast = parserFactory()().parse(self.__class__.__doc__)[0]
+    @classmethod
+    def setUpClass(cls):
+        ast = parserFactory()().parse(cls.__doc__)[0]
         mibInfo, symtable = SymtableCodeGen().genCode(ast, {}, genTexts=True)
-        self.mibInfo, pycode = PySnmpCodeGen().genCode(ast, {mibInfo.name: symtable}, genTexts=True)
+        cls.mibInfo, pycode = PySnmpCodeGen().genCode(ast, {mibInfo.name: symtable}, genTexts=True)
         codeobj = compile(pycode, 'test', 'exec')
 
         mibBuilder = MibBuilder()
         mibBuilder.loadTexts = True
 
-        self.ctx = {'mibBuilder': mibBuilder}
+        cls.ctx = {'mibBuilder': mibBuilder}
 
-        exec(codeobj, self.ctx, self.ctx)
+        exec(codeobj, cls.ctx, cls.ctx)
 
     def protoTestSymbol(self, symbol, klass):
         self.assertTrue(
@@ -166,7 +167,7 @@ typesMap = (
     ('TestTypeOpaque', 'Opaque'),
     ('TestTypeCounter64', 'Counter64'),
     ('TestTypeUnsigned32', 'Unsigned32'),
-    ('TestTypeTestTypeEnum', 'Integer32'),
+    ('TestTypeEnum', 'Integer32'),
     ('TestTypeSizeRangeConstraint', 'OctetString'),
     ('TestTypeSizeConstraint', 'OctetString'),
     ('TestTypeRangeConstraint', 'Integer32'),
@@ -182,9 +183,9 @@ def decor(func, symbol, klass):
 
 
 for s, k in typesMap:
-    setattr(TypeDeclarationTestCase, 'testTypeDeclaration' + k + 'SymbolTestCase',
+    setattr(TypeDeclarationTestCase, 'testTypeDeclaration' + s + 'SymbolTestCase',
             decor(TypeDeclarationTestCase.protoTestSymbol, s, k))
-    setattr(TypeDeclarationTestCase, 'testTypeDeclaration' + k + 'ClassTestCase',
+    setattr(TypeDeclarationTestCase, 'testTypeDeclaration' + s + 'ClassTestCase',
             decor(TypeDeclarationTestCase.protoTestClass, s, k))
 
 # XXX constraints flavor not checked
@@ -7,6 +7,7 @@
 import sys
 import os
 import tempfile
+import zipfile
 
 try:
     import unittest2 as unittest
@@ -14,13 +15,8 @@ try:
 except ImportError:
     import unittest
 
-try:
-    import StringIO
-
-except ImportError:
-    from io import StringIO
-
 from pysmi.reader.zipreader import ZipReader
+from pysmi import error
 
 
 class ZipReaderTestCase(unittest.TestCase):
@@ -217,6 +213,48 @@ class ZipReaderTestCase(unittest.TestCase):
             except Exception:
                 pass
 
+    def testGetDataRepeatedlyAndClose(self):
+        fd, filename = tempfile.mkstemp()
+
+        try:
+            os.write(fd, self.zipContents)
+            os.close(fd)
+
+            zipReader = ZipReader(filename, ignoreErrors=False)
+
+            for _ in range(2):
+                mibinfo, data = zipReader.getData('testC')
+
+                self.assertEqual(data, 'C\n', 'bad MIB data')
+
+            zipReader.close()
+
+            self.assertRaises(error.PySmiReaderFileNotFoundError, zipReader.getData, 'testC')
+
+        finally:
+            os.remove(filename)
+
+    def testGetDataMixedCase(self):
+        fd, filename = tempfile.mkstemp()
+        os.close(fd)
+
+        try:
+            archive = zipfile.ZipFile(filename, 'w')
+            archive.writestr('mibs/Test-Mib.my', 'TEST-MIB DEFINITIONS ::= BEGIN\nEND\n')
+            archive.close()
+
+            zipReader = ZipReader(filename, ignoreErrors=False)
+
+            mibinfo, data = zipReader.getData('TEST-MIB')
+
+            self.assertEqual(data, 'TEST-MIB DEFINITIONS ::= BEGIN\nEND\n', 'bad MIB data')
+
+            zipReader.close()
+
+        finally:
+            os.remove(filename)
+
+
 suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
 
 if __name__ == '__main__':